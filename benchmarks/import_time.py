@@ -0,0 +1,85 @@
+"""
+Benchmark of fmpsdk's start-up cost: importing the package, importing one endpoint, and loading every submodule.
+
+Each case runs in fresh interpreters and reports the best wall time and the number of modules it added to sys.modules.
+With --importtime the slowest imports of the full load are listed from python -X importtime.
+
+Usage: python benchmarks/import_time.py [--repeat N] [--importtime]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import typing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "import fmpsdk": "import fmpsdk",
+    "from fmpsdk import quote": "from fmpsdk import quote",
+    "every public name": "import fmpsdk\nfor name in fmpsdk.__all__: getattr(fmpsdk, name)",
+}
+
+TEMPLATE = """
+import sys, time, json
+before = len(sys.modules)
+started = time.perf_counter()
+{code}
+print(json.dumps({{"seconds": time.perf_counter() - started, "modules": len(sys.modules) - before}}))
+"""
+
+
+def run(code: str) -> typing.Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", TEMPLATE.format(code=code)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def slowest_imports(code: str, count: int = 15) -> typing.List[typing.Tuple[int, str]]:
+    """
+    Cumulative microseconds of the slowest top-level imports reported by -X importtime.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        # Each level of nesting is indented by two more spaces; deeper imports are already in their parent's time.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    for label, code in CASES.items():
+        samples = [run(code) for _ in range(args.repeat)]
+        best = min(sample["seconds"] for sample in samples)
+        print(f"{label:<26} {best * 1000:8.1f} ms  {samples[0]['modules']:4d} modules")
+    if args.importtime:
+        print("\nSlowest imports when every public name is loaded:")
+        for microseconds, name in slowest_imports(CASES["every public name"]):
+            print(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
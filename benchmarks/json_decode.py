@@ -0,0 +1,124 @@
+"""
+Micro-benchmark of the JSON decoders fmpsdk can use, on synthetic payloads shaped like real FMP responses.
+
+Usage: python benchmarks/json_decode.py [--repeat N]
+"""
+
+import argparse
+import datetime
+import json
+import random
+import string
+import timeit
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def historical_price_full(days: int = 10000) -> bytes:
+    """
+    About 40 years of daily bars for one symbol, like /historical-price-full/AAPL.
+    """
+    rng = random.Random(1)
+    start = datetime.date(1984, 1, 1)
+    close = 20.0
+    historical = []
+    for i in range(days):
+        open_ = close * (1 + rng.uniform(-0.02, 0.02))
+        close = open_ * (1 + rng.uniform(-0.03, 0.03))
+        change = close - open_
+        date = (start + datetime.timedelta(days=i)).isoformat()
+        historical.append(
+            {
+                "date": date,
+                "open": round(open_, 2),
+                "high": round(max(open_, close) * 1.01, 2),
+                "low": round(min(open_, close) * 0.99, 2),
+                "close": round(close, 2),
+                "adjClose": round(close * 0.98, 6),
+                "volume": rng.randint(10**6, 10**8),
+                "unadjustedVolume": rng.randint(10**6, 10**8),
+                "change": round(change, 2),
+                "changePercent": round(change / open_ * 100, 5),
+                "vwap": round((open_ + close) / 2, 4),
+                "label": datetime.date.fromisoformat(date).strftime("%B %d, %y"),
+                "changeOverTime": round(change / open_, 7),
+            }
+        )
+    return json.dumps({"symbol": "AAPL", "historical": historical[::-1]}).encode()
+
+
+def financial_statement_full_as_reported(
+    periods: int = 120, fields: int = 400
+) -> bytes:
+    """
+    Quarterly as-reported statements with hundreds of XBRL line items each, like
+    /financial-statement-full-as-reported/AAPL?period=quarter.
+    """
+    rng = random.Random(2)
+    names = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(12, 60)))
+        for _ in range(fields)
+    ]
+    statements = []
+    for i in range(periods):
+        statement = {
+            "date": f"{2024 - i // 4}-{3 * (4 - i % 4):02d}-30",
+            "symbol": "AAPL",
+            "period": f"Q{4 - i % 4}",
+            "documenttype": "10-Q",
+            "filingdate": f"{2024 - i // 4}-{3 * (4 - i % 4):02d}-30",
+        }
+        for name in names:
+            roll = rng.random()
+            if roll < 0.7:
+                statement[name] = rng.randint(-(10**11), 10**11)
+            elif roll < 0.9:
+                statement[name] = round(rng.uniform(-100, 100), 4)
+            else:
+                statement[name] = rng.choice(
+                    ["true", "false", "USD", "FY", "0000320193"]
+                )
+        statements.append(statement)
+    return json.dumps(statements).encode()
+
+
+def decoders() -> typing.Dict[str, typing.Callable[[bytes], typing.Any]]:
+    candidates = {
+        # What requests' Response.json() did before: decode the bytes to text, then parse the text.
+        "json (via text)": lambda content: json.loads(content.decode("utf-8")),
+        "json (bytes)": json.loads,
+    }
+    if orjson is not None:
+        candidates["orjson (bytes)"] = orjson.loads
+    return candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "historical_price_full": historical_price_full(),
+        "financial_statement_full_as_reported": financial_statement_full_as_reported(),
+    }
+    for name, content in payloads.items():
+        print(f"{name}: {len(content) / 1e6:.1f} MB")
+        baseline = None
+        for label, loads in decoders().items():
+            assert loads(content) == json.loads(content)
+            seconds = min(
+                timeit.repeat(lambda: loads(content), number=1, repeat=args.repeat)
+            )
+            baseline = baseline or seconds
+            print(f"  {label:<18} {seconds * 1000:8.2f} ms  {baseline / seconds:5.2f}x")
+    if orjson is None:
+        print("orjson is not installed; install it with 'pip install fmpsdk[fast]'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark of the memory a decoded result keeps alive in each result format, on synthetic quotes and daily bars.
+
+For every format the payload is decoded and converted, then the bytes still allocated afterwards, the peak allocated
+during the call (both from tracemalloc) and the time taken are reported.  Objects and columns are built from the
+decoded records, so their peak includes the records themselves; the saving is in what is kept.  Bars are decoded for
+several symbols, so interned symbol and date strings are shared between them as they would be in a long-lived cache.
+
+Usage: python benchmarks/record_memory.py [--symbols N] [--quotes N]
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+import typing
+
+# Run against the working tree rather than an installed fmpsdk.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_decode import historical_price_full  # noqa: E402
+
+from fmpsdk.columns import __format_result  # noqa: E402
+from fmpsdk.records import Bar, Quote  # noqa: E402
+
+
+def quotes(count: int) -> bytes:
+    """
+    A whole exchange's /quote/ results.
+    """
+    rng = random.Random(1)
+    results = []
+    for _ in range(count):
+        price = round(rng.uniform(1, 500), 2)
+        results.append(
+            {
+                "symbol": "".join(rng.choices(string.ascii_uppercase, k=4)),
+                "name": "".join(rng.choices(string.ascii_letters, k=20)),
+                "price": price,
+                "changesPercentage": round(rng.uniform(-5, 5), 4),
+                "change": round(rng.uniform(-5, 5), 2),
+                "dayLow": round(price * 0.98, 2),
+                "dayHigh": round(price * 1.02, 2),
+                "yearHigh": round(price * 1.4, 2),
+                "yearLow": round(price * 0.6, 2),
+                "marketCap": rng.randint(10**7, 10**12),
+                "priceAvg50": round(price * 0.99, 4),
+                "priceAvg200": round(price * 0.95, 4),
+                "exchange": rng.choice(["NASDAQ", "NYSE", "AMEX"]),
+                "volume": rng.randint(10**4, 10**8),
+                "avgVolume": rng.randint(10**4, 10**8),
+                "open": round(price * 1.01, 2),
+                "previousClose": round(price * 0.99, 2),
+                "eps": round(rng.uniform(-5, 20), 2),
+                "pe": round(rng.uniform(5, 80), 2),
+                "earningsAnnouncement": "2024-01-25T21:30:00.000+0000",
+                "sharesOutstanding": rng.randint(10**6, 10**10),
+                "timestamp": 1700000000 + rng.randint(0, 10**5),
+            }
+        )
+    return json.dumps(results).encode()
+
+
+def measure(build: typing.Callable[[], typing.Any]) -> typing.Tuple[int, int, float]:
+    """
+    Bytes still allocated by build()'s result, peak bytes allocated while it ran, and the seconds it took.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, seconds
+
+
+def report(
+    label: str,
+    payloads: typing.List[typing.Tuple[bytes, typing.Optional[str]]],
+    record_class: type,
+) -> None:
+    count = sum(len(json.loads(content)) for content, _ in payloads)
+    print(f"{label}: {count} records")
+    has_numpy = importlib.util.find_spec("numpy") is not None
+    if has_numpy:
+        # fmpsdk imports numpy on first use; import it now so its modules are not counted as retained memory.
+        import numpy  # noqa: F401
+
+    formats = ["records", "objects"] + (["columns"] if has_numpy else [])
+    baseline = None
+    for format in formats:
+        retained, peak, seconds = measure(
+            lambda: [
+                __format_result(json.loads(content), format, record_class, symbol)
+                for content, symbol in payloads
+            ]
+        )
+        baseline = baseline or retained
+        print(
+            f"  {format:<8} {retained / 1e6:8.1f} MB kept  {retained / count:6.0f} B/record"
+            f"  {baseline / retained:5.1f}x  {peak / 1e6:8.1f} MB peak  {seconds * 1000:8.1f} ms"
+        )
+    if not has_numpy:
+        print(
+            "  numpy is not installed; install it with 'pip install fmpsdk[columns]' to compare columns."
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--quotes", type=int, default=20000)
+    args = parser.parse_args()
+
+    report("quote", [(quotes(args.quotes), None)], Quote)
+    bars = []
+    for i in range(args.symbols):
+        # Only the historical list: with the envelope stripped each payload decodes straight to records.
+        historical = json.loads(historical_price_full(days=2500))["historical"]
+        bars.append((json.dumps(historical).encode(), f"SYM{i}"))
+    report("historical_price_full", bars, Bar)
+
+
+if __name__ == "__main__":
+    main()
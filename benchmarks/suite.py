@@ -0,0 +1,284 @@
+"""
+Benchmark suite for fmpsdk's transport, parsing and fan-out throughput, run against the local stand-in server.
+
+Measures single-call latency, fan-out calls/second at several concurrency levels (threads and asyncio), JSON decode
+time and peak RSS for the largest list endpoints, and cold import time.  Results are printed (or written with
+--output) as JSON so they can be compared release to release.
+
+Usage: python benchmarks/suite.py [--quick] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import typing
+
+import requests
+
+# Run against the working tree rather than an installed fmpsdk.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fmpsdk  # noqa: E402
+from fmpsdk import url_methods  # noqa: E402
+from fmpsdk.standin import StandInServer  # noqa: E402
+
+# The largest list endpoints and their paths.
+SYMBOL_LIST_ENDPOINTS = {
+    "symbols_list": "stock/list",
+    "available_traded_list": "available-traded/list",
+    "cik_list": "cik_list",
+}
+
+
+def summarize(samples: typing.List[float]) -> typing.Dict[str, float]:
+    """
+    Summary statistics of timings, in milliseconds.
+    """
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "min_ms": samples[0] * 1000,
+    }
+
+
+def single_call_latency(iterations: int) -> typing.Dict:
+    """
+    Time sequential calls on a warm connection, with no server latency, so only fmpsdk and localhost are measured.
+    """
+    calls = {
+        "quote": lambda: fmpsdk.quote(apikey="demo", symbol="AAPL"),
+        "company_profile": lambda: fmpsdk.company_profile(apikey="demo", symbol="AAPL"),
+        "historical_price_full": lambda: fmpsdk.historical_price_full(
+            apikey="demo", symbol="AAPL"
+        ),
+    }
+    results = {}
+    with StandInServer(endpoint_records={"historical-price-full": 10000}):
+        for name, call in calls.items():
+            call()
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - started)
+            results[name] = summarize(samples)
+    return results
+
+
+def fan_out(symbols: int, concurrency: typing.List[int], latency: float) -> typing.Dict:
+    """
+    Quote many symbols one call each, with fmpsdk.batch threads and with fmpsdk.aio, at each concurrency level.
+    """
+    import fmpsdk.aio
+
+    tickers = [f"SYM{i}" for i in range(symbols)]
+    results = {"symbols": symbols, "server_latency_s": latency, "threads": {}}
+    with StandInServer(latency=latency):
+        for workers in concurrency:
+            started = time.perf_counter()
+            outcome = fmpsdk.batch(
+                fmpsdk.quote, tickers, max_workers=workers, apikey="demo"
+            )
+            elapsed = time.perf_counter() - started
+            results["threads"][str(workers)] = {
+                "seconds": elapsed,
+                "calls_per_second": symbols / elapsed,
+                "errors": len(outcome.errors),
+            }
+
+        async def run_async(limit: int) -> typing.List:
+            try:
+                return await fmpsdk.aio.gather(
+                    *(fmpsdk.aio.quote(apikey="demo", symbol=s) for s in tickers),
+                    limit=limit,
+                )
+            finally:
+                await fmpsdk.aio.close_session()
+
+        results["asyncio"] = {}
+        for limit in concurrency:
+            fmpsdk.aio.configure_session(limit=limit, limit_per_host=limit)
+            started = time.perf_counter()
+            responses = asyncio.run(run_async(limit))
+            elapsed = time.perf_counter() - started
+            results["asyncio"][str(limit)] = {
+                "seconds": elapsed,
+                "calls_per_second": symbols / elapsed,
+                "errors": sum(1 for response in responses if not response),
+            }
+    return results
+
+
+def memory_kb(field: str) -> int:
+    """
+    Read VmRSS (current) or VmHWM (peak) resident memory, in KiB.  Unlike ru_maxrss, VmHWM is not inherited from the
+    parent process.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Not Linux: fall back to the peak reported by getrusage (bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def list_endpoint_worker(endpoint: str, stream: bool) -> typing.Dict:
+    """
+    Body of the child process that fetches one big list endpoint, so its peak RSS is not polluted by other runs.
+    """
+    from fmpsdk.decoder import __loads_json
+
+    baseline_kb = memory_kb("VmRSS")
+    func = getattr(fmpsdk, endpoint)
+    started = time.perf_counter()
+    if stream:
+        records = sum(1 for _ in func(apikey="demo", stream=True))
+    else:
+        records = len(func(apikey="demo"))
+    fetch_seconds = time.perf_counter() - started
+    peak_kb = memory_kb("VmHWM")
+
+    result = {
+        "records": records,
+        "fetch_and_decode_seconds": fetch_seconds,
+        "peak_rss_mb": peak_kb / 1024,
+        "rss_growth_mb": (peak_kb - baseline_kb) / 1024,
+    }
+    if not stream:
+        # Decode alone, on the raw body, with the configured decoder.
+        body = requests.get(
+            f"{url_methods.BASE_URL_v3}{SYMBOL_LIST_ENDPOINTS[endpoint]}"
+        ).content
+        samples = []
+        for _ in range(5):
+            started = time.perf_counter()
+            __loads_json(body)
+            samples.append(time.perf_counter() - started)
+        result["decoder"] = fmpsdk.json_decoder()
+        result["body_mb"] = len(body) / 1e6
+        result["decode_seconds"] = min(samples)
+    return result
+
+
+def list_endpoints(records: int) -> typing.Dict:
+    """
+    Fetch the largest list endpoints whole and streamed, each in a fresh process.
+    """
+    results = {"records": records}
+    with StandInServer(records=records, compress=False) as server:
+        for endpoint in SYMBOL_LIST_ENDPOINTS:
+            for stream in (False, True):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath(__file__),
+                        "--worker",
+                        endpoint,
+                        "--base-url",
+                        server.url,
+                    ]
+                    + (["--stream"] if stream else []),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                label = f"{endpoint}{' (stream)' if stream else ''}"
+                results[label] = json.loads(output)
+    return results
+
+
+def cold_import(repeat: int) -> typing.Dict:
+    """
+    Time `import fmpsdk` in fresh interpreters.
+    """
+    code = "import time; t = time.perf_counter(); import fmpsdk; print(time.perf_counter() - t)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=root,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return summarize(samples)
+
+
+def git_revision() -> typing.Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Smaller, faster runs.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--stream", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    if args.worker:
+        url_methods.BASE_URL_v3 = f"{args.base_url}/api/v3/"
+        url_methods.BASE_URL_v4 = f"{args.base_url}/api/v4/"
+        print(json.dumps(list_endpoint_worker(args.worker, args.stream)))
+        return
+
+    fmpsdk.disable_cache()
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_decoder": fmpsdk.json_decoder(),
+            "quick": args.quick,
+        },
+        "single_call_latency": single_call_latency(20 if args.quick else 200),
+        "fan_out": fan_out(
+            symbols=200 if args.quick else 1000,
+            concurrency=[8, 32] if args.quick else [1, 8, 32, 128],
+            latency=args.latency,
+        ),
+        "list_endpoints": list_endpoints(20000 if args.quick else 100000),
+        "cold_import": cold_import(3 if args.quick else 10),
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,116 +1,308 @@
+import importlib
 import logging
+import sys
+import types
+import typing
 
-from .alternative_data import (
-    commitment_of_traders_report,
-    commitment_of_traders_report_analysis,
-    commitment_of_traders_report_list,
-)
-from .calendar import (
-    dividend_calendar,
-    earning_calendar,
-    economic_calendar,
-    historical_earning_calendar,
-    ipo_calendar,
-    stock_split_calendar,
-)
-from .commodities import available_commodities, commodities_list
-from .company_valuation import (
-    available_traded_list,
-    balance_sheet_statement,
-    balance_sheet_statement_as_reported,
-    balance_sheet_statement_growth,
-    cash_flow_statement,
-    cash_flow_statement_as_reported,
-    cash_flow_statement_growth,
-    company_profile,
-    delisted_companies,
-    discounted_cash_flow,
-    earnings_surprises,
-    enterprise_values,
-    etf_list,
-    financial_growth,
-    financial_ratios,
-    financial_ratios_ttm,
-    financial_statement,
-    financial_statement_full_as_reported,
-    financial_statement_symbol_lists,
-    historical_daily_discounted_cash_flow,
-    historical_discounted_cash_flow,
-    historical_market_capitalization,
-    historical_rating,
-    income_statement,
-    income_statement_as_reported,
-    income_statement_growth,
-    key_executives,
-    key_metrics,
-    key_metrics_ttm,
-    market_capitalization,
-    press_releases,
-    rating,
-    search,
-    search_ticker,
-    sec_filings,
-    stock_news,
-    stock_screener,
-    symbols_list,
-)
-from .cryptocurrencies import available_cryptocurrencies, cryptocurrencies_list
-from .etf import available_efts, available_etfs, etf_price_realtime
-from .euronext import available_euronext, euronext_list
-from .forex import available_forex, forex, forex_list
-from .general import historical_chart, historical_price_full, quote
-from .insider_trading import (
-    insider_trading,
-    insider_trading_rss_feed,
-    mapper_cik_company,
-    mapper_cik_name,
-)
-from .institutional_fund import (
-    cik,
-    cik_list,
-    cik_search,
-    cusip,
-    etf_country_weightings,
-    etf_holders,
-    etf_sector_weightings,
-    form_13f,
-    institutional_holders,
-    mutual_fund_holders,
-    sec_rss_feeds,
-)
-from .market_indexes import (
-    available_indexes,
-    dowjones_constituent,
-    historical_dowjones_constituent,
-    historical_nasdaq_constituent,
-    historical_sp500_constituent,
-    indexes,
-    nasdaq_constituent,
-    sp500_constituent,
-)
-from .mutual_funds import available_mutual_funds, mutual_fund_list
-from .senate import (
-    senate_disclosure_rss,
-    senate_disclosure_symbol,
-    senate_trading_rss,
-    senate_trading_symbol,
-)
-from .shares_float import shares_float
-from .stock_market import actives, gainers, losers, market_hours, sectors_performance
-from .stock_time_series import (
-    exchange_realtime,
-    historical_stock_dividend,
-    historical_stock_split,
-    historical_survivorship_bias_free_eod,
-    quote_short,
-)
-from .technical_indicators import technical_indicators
-from .tsx import available_tsx, tsx_list
+if typing.TYPE_CHECKING:
+    from .alternative_data import (
+        commitment_of_traders_report,
+        commitment_of_traders_report_analysis,
+        commitment_of_traders_report_list,
+    )
+    from .archives import StatementArchive
+    from .cache import (
+        CacheInfo,
+        MemoryCache,
+        SQLiteCache,
+        cache_info,
+        clear_cache,
+        disable_cache,
+        enable_cache,
+    )
+    from .calendar import (
+        dividend_calendar,
+        earning_calendar,
+        economic_calendar,
+        historical_earning_calendar,
+        ipo_calendar,
+        stock_split_calendar,
+    )
+    from .client import FMPClient
+    from .commodities import available_commodities, commodities_list
+    from .company_valuation import (
+        available_traded_list,
+        balance_sheet_statement,
+        balance_sheet_statement_as_reported,
+        balance_sheet_statement_growth,
+        cash_flow_statement,
+        cash_flow_statement_as_reported,
+        cash_flow_statement_growth,
+        company_profile,
+        delisted_companies,
+        discounted_cash_flow,
+        earnings_surprises,
+        enterprise_values,
+        etf_list,
+        financial_growth,
+        financial_ratios,
+        financial_ratios_ttm,
+        financial_statement,
+        financial_statement_full_as_reported,
+        financial_statement_symbol_lists,
+        historical_daily_discounted_cash_flow,
+        historical_discounted_cash_flow,
+        historical_market_capitalization,
+        historical_rating,
+        income_statement,
+        income_statement_as_reported,
+        income_statement_growth,
+        key_executives,
+        key_metrics,
+        key_metrics_ttm,
+        market_capitalization,
+        press_releases,
+        rating,
+        search,
+        search_ticker,
+        sec_filings,
+        stock_news,
+        stock_screener,
+        symbols_list,
+    )
+    from .compression import TransferStats, reset_transfer_stats, transfer_stats
+    from .cryptocurrencies import available_cryptocurrencies, cryptocurrencies_list
+    from .decoder import json_decoder, set_json_decoder
+    from .etf import available_efts, available_etfs, etf_price_realtime
+    from .euronext import available_euronext, euronext_list
+    from .exceptions import FMPError, FMPRateLimitError, FMPRequestError
+    from .export import ExportSummary, export_statements
+    from .fan_out import BatchResult, batch
+    from .forex import available_forex, forex, forex_list
+    from .general import historical_chart, historical_price_full, quote
+    from .insider_trading import (
+        insider_trading,
+        insider_trading_rss_feed,
+        mapper_cik_company,
+        mapper_cik_name,
+    )
+    from .institutional_fund import (
+        cik,
+        cik_list,
+        cik_search,
+        cusip,
+        etf_country_weightings,
+        etf_holders,
+        etf_sector_weightings,
+        form_13f,
+        institutional_holders,
+        mutual_fund_holders,
+        sec_rss_feeds,
+    )
+    from .market_indexes import (
+        available_indexes,
+        dowjones_constituent,
+        historical_dowjones_constituent,
+        historical_nasdaq_constituent,
+        historical_sp500_constituent,
+        indexes,
+        nasdaq_constituent,
+        sp500_constituent,
+    )
+    from .metrics import (
+        MetricsCollector,
+        RequestEvent,
+        add_request_hook,
+        remove_request_hook,
+    )
+    from .mutual_funds import available_mutual_funds, mutual_fund_list
+    from .rate_limit import TokenBucket, clear_rate_limit, set_rate_limit
+    from .records import Bar, IntradayBar, Quote, QuoteShort
+    from .senate import (
+        senate_disclosure_rss,
+        senate_disclosure_symbol,
+        senate_trading_rss,
+        senate_trading_symbol,
+    )
+    from .shares_float import shares_float
+    from .stock_market import (
+        actives,
+        gainers,
+        losers,
+        market_hours,
+        sectors_performance,
+    )
+    from .stock_time_series import (
+        exchange_realtime,
+        historical_stock_dividend,
+        historical_stock_split,
+        historical_survivorship_bias_free_eod,
+        quote_short,
+    )
+    from .sync import PriceStore, SyncSummary, sync_prices
+    from .technical_indicators import technical_indicators
+    from .tsx import available_tsx, tsx_list
+    from .url_methods import (
+        RetryPolicy,
+        close_session,
+        configure_retries,
+        configure_session,
+    )
+
+# Where each public name is defined.  Submodules are imported on first access (PEP 562), so `import fmpsdk` stays cheap
+# and an endpoint's dependencies (requests, settings...) load only when it is used.  Keep in sync with the imports above.
+__attribute_modules: typing.Dict[str, str] = {
+    "commitment_of_traders_report": "alternative_data",
+    "commitment_of_traders_report_analysis": "alternative_data",
+    "commitment_of_traders_report_list": "alternative_data",
+    "StatementArchive": "archives",
+    "CacheInfo": "cache",
+    "FMPClient": "client",
+    "MemoryCache": "cache",
+    "SQLiteCache": "cache",
+    "cache_info": "cache",
+    "clear_cache": "cache",
+    "disable_cache": "cache",
+    "enable_cache": "cache",
+    "dividend_calendar": "calendar",
+    "earning_calendar": "calendar",
+    "economic_calendar": "calendar",
+    "historical_earning_calendar": "calendar",
+    "ipo_calendar": "calendar",
+    "stock_split_calendar": "calendar",
+    "available_commodities": "commodities",
+    "commodities_list": "commodities",
+    "available_traded_list": "company_valuation",
+    "balance_sheet_statement": "company_valuation",
+    "balance_sheet_statement_as_reported": "company_valuation",
+    "balance_sheet_statement_growth": "company_valuation",
+    "cash_flow_statement": "company_valuation",
+    "cash_flow_statement_as_reported": "company_valuation",
+    "cash_flow_statement_growth": "company_valuation",
+    "company_profile": "company_valuation",
+    "delisted_companies": "company_valuation",
+    "discounted_cash_flow": "company_valuation",
+    "earnings_surprises": "company_valuation",
+    "enterprise_values": "company_valuation",
+    "etf_list": "company_valuation",
+    "financial_growth": "company_valuation",
+    "financial_ratios": "company_valuation",
+    "financial_ratios_ttm": "company_valuation",
+    "financial_statement": "company_valuation",
+    "financial_statement_full_as_reported": "company_valuation",
+    "financial_statement_symbol_lists": "company_valuation",
+    "historical_daily_discounted_cash_flow": "company_valuation",
+    "historical_discounted_cash_flow": "company_valuation",
+    "historical_market_capitalization": "company_valuation",
+    "historical_rating": "company_valuation",
+    "income_statement": "company_valuation",
+    "income_statement_as_reported": "company_valuation",
+    "income_statement_growth": "company_valuation",
+    "key_executives": "company_valuation",
+    "key_metrics": "company_valuation",
+    "key_metrics_ttm": "company_valuation",
+    "market_capitalization": "company_valuation",
+    "press_releases": "company_valuation",
+    "rating": "company_valuation",
+    "search": "company_valuation",
+    "search_ticker": "company_valuation",
+    "sec_filings": "company_valuation",
+    "stock_news": "company_valuation",
+    "stock_screener": "company_valuation",
+    "symbols_list": "company_valuation",
+    "TransferStats": "compression",
+    "reset_transfer_stats": "compression",
+    "transfer_stats": "compression",
+    "available_cryptocurrencies": "cryptocurrencies",
+    "cryptocurrencies_list": "cryptocurrencies",
+    "json_decoder": "decoder",
+    "set_json_decoder": "decoder",
+    "available_efts": "etf",
+    "available_etfs": "etf",
+    "etf_price_realtime": "etf",
+    "available_euronext": "euronext",
+    "euronext_list": "euronext",
+    "FMPError": "exceptions",
+    "FMPRateLimitError": "exceptions",
+    "FMPRequestError": "exceptions",
+    "ExportSummary": "export",
+    "PriceStore": "sync",
+    "SyncSummary": "sync",
+    "sync_prices": "sync",
+    "export_statements": "export",
+    "BatchResult": "fan_out",
+    "batch": "fan_out",
+    "available_forex": "forex",
+    "forex": "forex",
+    "forex_list": "forex",
+    "historical_chart": "general",
+    "historical_price_full": "general",
+    "quote": "general",
+    "insider_trading": "insider_trading",
+    "insider_trading_rss_feed": "insider_trading",
+    "mapper_cik_company": "insider_trading",
+    "mapper_cik_name": "insider_trading",
+    "cik": "institutional_fund",
+    "cik_list": "institutional_fund",
+    "cik_search": "institutional_fund",
+    "cusip": "institutional_fund",
+    "etf_country_weightings": "institutional_fund",
+    "etf_holders": "institutional_fund",
+    "etf_sector_weightings": "institutional_fund",
+    "form_13f": "institutional_fund",
+    "institutional_holders": "institutional_fund",
+    "mutual_fund_holders": "institutional_fund",
+    "sec_rss_feeds": "institutional_fund",
+    "available_indexes": "market_indexes",
+    "dowjones_constituent": "market_indexes",
+    "historical_dowjones_constituent": "market_indexes",
+    "historical_nasdaq_constituent": "market_indexes",
+    "historical_sp500_constituent": "market_indexes",
+    "indexes": "market_indexes",
+    "nasdaq_constituent": "market_indexes",
+    "sp500_constituent": "market_indexes",
+    "MetricsCollector": "metrics",
+    "RequestEvent": "metrics",
+    "add_request_hook": "metrics",
+    "remove_request_hook": "metrics",
+    "available_mutual_funds": "mutual_funds",
+    "mutual_fund_list": "mutual_funds",
+    "TokenBucket": "rate_limit",
+    "Bar": "records",
+    "IntradayBar": "records",
+    "Quote": "records",
+    "QuoteShort": "records",
+    "clear_rate_limit": "rate_limit",
+    "set_rate_limit": "rate_limit",
+    "senate_disclosure_rss": "senate",
+    "senate_disclosure_symbol": "senate",
+    "senate_trading_rss": "senate",
+    "senate_trading_symbol": "senate",
+    "shares_float": "shares_float",
+    "actives": "stock_market",
+    "gainers": "stock_market",
+    "losers": "stock_market",
+    "market_hours": "stock_market",
+    "sectors_performance": "stock_market",
+    "exchange_realtime": "stock_time_series",
+    "historical_stock_dividend": "stock_time_series",
+    "historical_stock_split": "stock_time_series",
+    "historical_survivorship_bias_free_eod": "stock_time_series",
+    "quote_short": "stock_time_series",
+    "technical_indicators": "technical_indicators",
+    "available_tsx": "tsx",
+    "tsx_list": "tsx",
+    "RetryPolicy": "url_methods",
+    "close_session": "url_methods",
+    "configure_retries": "url_methods",
+    "configure_session": "url_methods",
+}
 
 attribution: str = "Data provided by Financial Modeling Prep"
 logging.info(attribution)
 
-__all__ = [
+# Every public function that queries an FMP endpoint.  fmpsdk.aio mirrors each of these.
+ENDPOINTS: typing.List[str] = [
     "quote",
     "historical_chart",
     "historical_price_full",
@@ -216,3 +408,73 @@ __all__ = [
     "senate_disclosure_symbol",
     "shares_float",
 ]
+
+__all__ = ENDPOINTS + [
+    "FMPClient",
+    "configure_session",
+    "close_session",
+    "batch",
+    "BatchResult",
+    "export_statements",
+    "ExportSummary",
+    "sync_prices",
+    "PriceStore",
+    "SyncSummary",
+    "StatementArchive",
+    "Quote",
+    "QuoteShort",
+    "Bar",
+    "IntradayBar",
+    "FMPError",
+    "FMPRequestError",
+    "FMPRateLimitError",
+    "set_rate_limit",
+    "clear_rate_limit",
+    "TokenBucket",
+    "configure_retries",
+    "RetryPolicy",
+    "enable_cache",
+    "disable_cache",
+    "clear_cache",
+    "cache_info",
+    "CacheInfo",
+    "MemoryCache",
+    "SQLiteCache",
+    "set_json_decoder",
+    "json_decoder",
+    "transfer_stats",
+    "reset_transfer_stats",
+    "TransferStats",
+    "add_request_hook",
+    "remove_request_hook",
+    "RequestEvent",
+    "MetricsCollector",
+]
+
+
+def __getattr__(name: str) -> typing.Any:
+    """
+    Import the submodule that defines name on first access and cache the attribute on the package.
+    """
+    module_name = __attribute_modules.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        # Importing a submodule binds it on the package.  Where a public function shares its submodule's name
+        # (shares_float), keep the function.
+        if isinstance(value, types.ModuleType) and name in __all__:
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
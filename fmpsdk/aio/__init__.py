@@ -0,0 +1,26 @@
+"""
+Awaitable versions of every fmpsdk endpoint function.
+
+Each function has the same name and parameters as its synchronous twin in fmpsdk, but its HTTP requests run on a
+shared aiohttp connection pool so thousands of calls can overlap on one event loop:
+
+    profiles = await fmpsdk.aio.gather(
+        *(fmpsdk.aio.company_profile(apikey=apikey, symbol=s) for s in symbols), limit=50
+    )
+"""
+
+import typing
+
+import fmpsdk
+
+from .url_methods import __make_async, close_session, configure_session, gather
+
+for _name in fmpsdk.ENDPOINTS:
+    globals()[_name] = __make_async(getattr(fmpsdk, _name))
+del _name
+
+__all__: typing.List[str] = fmpsdk.ENDPOINTS + [
+    "gather",
+    "configure_session",
+    "close_session",
+]
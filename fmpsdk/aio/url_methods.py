@@ -0,0 +1,400 @@
+import asyncio
+import functools
+import logging
+import time
+import typing
+import weakref
+
+import requests
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError(
+        "fmpsdk.aio requires aiohttp.  Install it with 'pip install fmpsdk[aio]'."
+    ) from e
+
+from ..cache import __conditional_headers
+from ..compression import ACCEPT_ENCODING, __decompress, __record_transfer
+from ..metrics import RequestEvent, __emit, __new_event
+from ..settings import DEFAULT_AIO_LIMIT, DEFAULT_KEEP_ALIVE, DEFAULT_POOL_MAXSIZE
+from ..url_methods import (
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    DeferredRequest,
+    PendingRequest,
+    __decode_json,
+    __deferred_responses,
+    __get_rate_limiter,
+    __get_request_hooks,
+    __get_response_cache,
+    __get_retry_policy,
+    __write_file,
+)
+
+# aiohttp sessions are bound to the event loop that created them, so keep one pooled session per loop.
+__sessions: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]"
+) = weakref.WeakKeyDictionary()
+__session_options: typing.Dict = {
+    "limit": DEFAULT_AIO_LIMIT,
+    "limit_per_host": DEFAULT_POOL_MAXSIZE,
+    "keep_alive": DEFAULT_KEEP_ALIVE,
+}
+
+
+def configure_session(
+    limit: int = DEFAULT_AIO_LIMIT,
+    limit_per_host: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = DEFAULT_KEEP_ALIVE,
+) -> None:
+    """
+    Set the connection pool options used for async sessions created from now on.
+
+    Call close_session() first to apply new options to an event loop that already has a session.
+    :param limit: Maximum number of simultaneous connections.
+    :param limit_per_host: Maximum number of simultaneous connections to one host.
+    :param keep_alive: If False, close each connection after its response is read.
+    """
+    __session_options.update(
+        limit=limit, limit_per_host=limit_per_host, keep_alive=keep_alive
+    )
+
+
+async def close_session() -> None:
+    """
+    Close the running event loop's shared session and all of its pooled connections.
+    """
+    session = __sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def __on_request_start(session, context, params) -> None:
+    context.request_started = time.perf_counter()
+
+
+async def __on_dns_resolvehost_start(session, context, params) -> None:
+    context.dns_started = time.perf_counter()
+
+
+async def __on_dns_resolvehost_end(session, context, params) -> None:
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.dns = time.perf_counter() - context.dns_started
+
+
+async def __on_connection_create_start(session, context, params) -> None:
+    context.connect_started = time.perf_counter()
+
+
+async def __on_connection_create_end(session, context, params) -> None:
+    event = context.trace_request_ctx
+    if event is not None:
+        # aiohttp resolves the name and shakes hands over TLS while creating the connection.
+        event.connect = (
+            time.perf_counter() - context.connect_started - (event.dns or 0.0)
+        )
+
+
+async def __on_request_end(session, context, params) -> None:
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.first_byte = (
+            time.perf_counter() - context.request_started
+        )
+
+
+def __trace_config() -> aiohttp.TraceConfig:
+    """
+    Build the tracing hooks that record connection timings on the RequestEvent passed as trace_request_ctx.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(__on_request_start)
+    trace_config.on_dns_resolvehost_start.append(__on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(__on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(__on_connection_create_start)
+    trace_config.on_connection_create_end.append(__on_connection_create_end)
+    trace_config.on_request_end.append(__on_request_end)
+    return trace_config
+
+
+def __get_session() -> aiohttp.ClientSession:
+    """
+    Return the running event loop's shared session, creating it on first use.
+    :return: The shared aiohttp.ClientSession.
+    """
+    loop = asyncio.get_running_loop()
+    session = __sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=__session_options["limit"],
+            limit_per_host=__session_options["limit_per_host"],
+            force_close=not __session_options["keep_alive"],
+        )
+        # Bodies are decompressed by fmpsdk itself so the bytes on the wire can be counted.
+        session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            auto_decompress=False,
+            trace_configs=[__trace_config()],
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+            ),
+        )
+        __sessions[loop] = session
+    return session
+
+
+# Errors raised while sending a request or reading its body that are worth retrying.
+__RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+)
+
+
+async def __get(
+    request: PendingRequest,
+    headers: typing.Optional[typing.Dict[str, str]] = None,
+    event: typing.Optional[RequestEvent] = None,
+) -> typing.Tuple[int, typing.Mapping[str, str], bytes]:
+    """
+    GET a deferred request on the shared async session, waiting for the rate limiter and retrying per the retry
+    policy.
+
+    :param request: The request to perform.
+    :param headers: Extra request headers.
+    :param event: Event on which to record the status, timings, sizes and retry count of the last attempt.
+    :return: Status code, headers and decompressed body of the last response.  Raises the last error if no
+        response could be received.
+    """
+    url = request.url
+    # Encode the query exactly like requests does (e.g. None values are dropped, booleans become "True").
+    prepared_url = requests.Request("GET", url, params=request.query_vars).prepare().url
+    policy = __get_retry_policy()
+    give_up_at = time.monotonic() + policy.deadline
+    attempt = 0
+    while True:
+        bucket = __get_rate_limiter(request.query_vars)
+        if bucket is not None:
+            await asyncio.sleep(bucket.reserve())
+        if event is not None:
+            event.retries = attempt
+            event.dns = event.connect = None
+        try:
+            async with __get_session().get(
+                prepared_url,
+                headers=headers,
+                allow_redirects=True,
+                trace_request_ctx=event,
+            ) as response:
+                wire_content = await response.read()
+            content = __decompress(
+                wire_content, response.headers.get("Content-Encoding")
+            )
+            __record_transfer(request.path, len(wire_content), len(content))
+            if event is not None:
+                event.status = response.status
+                event.compressed_bytes = len(wire_content)
+                event.decompressed_bytes = len(content)
+        except __RETRYABLE_ERRORS:
+            if attempt >= policy.max_retries:
+                raise
+            delay = policy.delay(attempt)
+            if time.monotonic() + delay > give_up_at:
+                raise
+            reason = "request error"
+        else:
+            if (
+                response.status not in policy.status_codes
+                or attempt >= policy.max_retries
+            ):
+                return response.status, response.headers, content
+            delay = policy.delay(attempt, response.headers.get("Retry-After"))
+            if time.monotonic() + delay > give_up_at:
+                return response.status, response.headers, content
+            reason = f"HTTP {response.status}"
+        attempt += 1
+        logging.warning(
+            f"Retrying {url} after {reason} in {delay:.2f}s (retry {attempt} of {policy.max_retries})."
+        )
+        await asyncio.sleep(delay)
+
+
+# Requests currently being made on each event loop, so concurrent identical calls can share them.
+__in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, typing.Dict[typing.Tuple, asyncio.Future]]" = (weakref.WeakKeyDictionary())
+
+
+async def __perform_once(request: PendingRequest) -> typing.Any:
+    """
+    Perform a deferred request, or wait for an identical one already in flight on this event loop and share its
+    decoded result.  Downloads are never shared.
+    """
+    if request.filename is not None:
+        return await __perform(request)
+    flights = __in_flight.setdefault(asyncio.get_running_loop(), {})
+    key = request.key
+    flight = flights.get(key)
+    if flight is None:
+        flight = flights[key] = asyncio.ensure_future(__perform(request))
+        flight.add_done_callback(lambda _: flights.pop(key, None))
+    # Shield the shared request so one cancelled caller does not cancel it for the others.
+    return await asyncio.shield(flight)
+
+
+async def __perform(request: PendingRequest) -> typing.Any:
+    """
+    Perform one deferred request on the shared async session and report it to the request hooks.
+
+    Errors are logged and None returned, exactly like the synchronous request layer.
+    :param request: The request to perform.
+    :return: Decoded JSON, or None for downloads and failed requests.
+    """
+    started = time.perf_counter()
+    event = __new_event(request.path)
+    try:
+        return await __perform_request(request, event)
+    finally:
+        __emit(event, started, __get_request_hooks())
+
+
+def __request_failed(message: str, event: RequestEvent) -> None:
+    event.error = message
+    logging.error(message)
+
+
+async def __perform_request(request: PendingRequest, event: RequestEvent) -> typing.Any:
+    url = request.url
+    cache = __get_response_cache()
+    decode = bytes if request.raw else __decode_json
+    try:
+        cached, fresh = None, False
+        if request.filename is None:
+            cached, fresh = cache.lookup(
+                request.base_url, request.path, request.query_vars
+            )
+            if fresh:
+                event.cache = "hit"
+                return decode(cached.content)
+            if cache.cacheable(request.path):
+                event.cache = "miss"
+
+        status, headers, content = await __get(
+            request, __conditional_headers(cached), event
+        )
+        if status == 304 and cached is not None:
+            event.cache = "revalidated"
+            cache.revalidated(
+                request.base_url, request.path, request.query_vars, cached
+            )
+            return decode(cached.content)
+        if status == 429:
+            __request_failed(
+                f"Request to {url} was rejected because the API rate limit was exceeded (HTTP 429).",
+                event,
+            )
+            return None
+        if status >= 500:
+            __request_failed(
+                f"Request to {url} failed with HTTP status {status}.", event
+            )
+            return None
+        if request.filename is not None:
+            if status >= 400:
+                # Leave the target file alone rather than saving the error body as if it were the download.
+                __request_failed(
+                    f"Download of {url} failed with HTTP status {status}.", event
+                )
+                return None
+            await asyncio.get_running_loop().run_in_executor(
+                None, __write_file, request, content
+            )
+            return None
+        return_var = decode(content)
+        if status == 200:
+            cache.store(
+                request.base_url, request.path, request.query_vars, content, headers
+            )
+        return return_var
+
+    except asyncio.TimeoutError:
+        __request_failed(f"Connection to {url} timed out.", event)
+    except aiohttp.TooManyRedirects:
+        __request_failed(
+            f"Request to {url} exceeds the maximum number of predefined redirections.",
+            event,
+        )
+    except aiohttp.ClientConnectionError:
+        __request_failed(
+            f"Connection to {url} failed:  DNS failure, refused connection or some other connection related "
+            f"issue.",
+            event,
+        )
+    except Exception as e:
+        __request_failed(
+            f"A requests exception has occurred that we have not yet detailed an 'except' clause for.  "
+            f"Error: {e}",
+            event,
+        )
+    return None
+
+
+async def __run(func: typing.Callable, *args, **kwargs) -> typing.Any:
+    """
+    Drive a synchronous endpoint function without blocking the event loop.
+
+    The function runs with its HTTP requests deferred: each time it needs a response it raises DeferredRequest, the
+    requests are performed concurrently on the async session and the function is called again with the recorded
+    results until it returns.
+    :param func: A synchronous fmpsdk endpoint function.
+    :return: Whatever func returns.
+    """
+    responses: typing.Dict = {}
+    while True:
+        token = __deferred_responses.set(responses)
+        try:
+            return func(*args, **kwargs)
+        except DeferredRequest as e:
+            pending = e.pending
+        finally:
+            __deferred_responses.reset(token)
+        results = await asyncio.gather(
+            *(__perform_once(request) for request in pending)
+        )
+        for request, result in zip(pending, results):
+            responses[request.key] = result
+
+
+def __make_async(func: typing.Callable) -> typing.Callable:
+    """
+    Build the awaitable twin of a synchronous endpoint function, with the same name, parameters and docstring.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await __run(func, *args, **kwargs)
+
+    return wrapper
+
+
+async def gather(
+    *aws: typing.Awaitable,
+    limit: int = DEFAULT_AIO_LIMIT,
+    return_exceptions: bool = False,
+) -> typing.List:
+    """
+    Like asyncio.gather(), but run at most `limit` of the awaitables at the same time.
+
+    :param aws: Awaitables, e.g. fmpsdk.aio.company_profile(apikey=apikey, symbol=symbol) for many symbols.
+    :param limit: Maximum number of awaitables in flight.
+    :param return_exceptions: Passed through to asyncio.gather().
+    :return: Results in the order of aws.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(aw: typing.Awaitable) -> typing.Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(bounded(aw) for aw in aws), return_exceptions=return_exceptions
+    )
@@ -0,0 +1,80 @@
+import csv
+import io
+import re
+import threading
+import typing
+import zipfile
+
+
+class StatementArchive(typing.Mapping[str, typing.Any]):
+    """
+    A financial statement ZIP held in memory, as returned by financial_statement(..., in_memory=True).
+
+    It maps each member's name to its content.  Members are only decompressed and parsed when first accessed, then
+    kept.  CSV members become lists of dictionaries, with empty cells as None and numbers as int or float, like the
+    JSON endpoints return them; other members are returned as bytes.
+    :param content: The ZIP archive's bytes.
+    """
+
+    # A CSV cell holding a plain decimal number.  Numbers with leading zeros (CIKs...) are kept as text.
+    __NUMBER = re.compile(r"^-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?$")
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.__archive = zipfile.ZipFile(io.BytesIO(content))
+        self.__members: typing.Dict[str, typing.Any] = {}
+        # Members are read through the archive's one file position.
+        self.__lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> typing.Any:
+        with self.__lock:
+            if name not in self.__members:
+                try:
+                    member = self.__archive.open(name)
+                except KeyError:
+                    raise KeyError(name) from None
+                with member:
+                    self.__members[name] = (
+                        self.__parse_csv(member)
+                        if name.lower().endswith(".csv")
+                        else member.read()
+                    )
+            return self.__members[name]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.__archive.namelist())
+
+    def __len__(self) -> int:
+        return len(self.__archive.namelist())
+
+    def __repr__(self) -> str:
+        return f"StatementArchive({self.__archive.namelist()!r})"
+
+    @classmethod
+    def __parse_cell(cls, value: str) -> typing.Union[str, int, float, None]:
+        if value == "":
+            return None
+        match = cls.__NUMBER.match(value)
+        if match is None:
+            return value
+        if match.group(2) is None and match.group(3) is None:
+            return int(value)
+        return float(value)
+
+    @classmethod
+    def __parse_csv(cls, member: typing.IO[bytes]) -> typing.List[typing.Dict]:
+        """
+        Parse a CSV member into a list of dictionaries, reading it as it is decompressed.
+        """
+        text = io.TextIOWrapper(member, encoding="utf-8-sig", newline="")
+        return [
+            {key: cls.__parse_cell(value) for key, value in row.items()}
+            for row in csv.DictReader(text)
+        ]
+
+    def save(self, filename: str) -> None:
+        """
+        Write the archive to disk, as financial_statement() does without in_memory.
+        """
+        with open(filename, "wb") as f:
+            f.write(self.content)
@@ -0,0 +1,370 @@
+import collections
+import dataclasses
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+from .settings import CACHE_TTLS, DEFAULT_CACHE_MAXSIZE, DEFAULT_CACHE_TTL
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    """
+    A cached API response.
+
+    :param content: Raw response body.
+    :param fetched_at: Unix time the response was received or last revalidated.
+    :param etag: The response's ETag header, used to revalidate it once stale.
+    :param last_modified: The response's Last-Modified header, used to revalidate it once stale.
+    """
+
+    content: bytes
+    fetched_at: float
+    etag: typing.Optional[str] = None
+    last_modified: typing.Optional[str] = None
+
+
+class MemoryCache:
+    """
+    Thread-safe, size-bounded in-process cache that evicts the least recently used entry.
+
+    :param maxsize: Maximum number of responses to keep.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self.__entries: "collections.OrderedDict[typing.Tuple, CacheEntry]" = (
+            collections.OrderedDict()
+        )
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: typing.Tuple) -> typing.Optional[CacheEntry]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def set(self, key: typing.Tuple, entry: CacheEntry) -> None:
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+
+class SQLiteCache:
+    """
+    Persistent cache stored in a SQLite database file.
+
+    Survives restarts and can be shared by several processes on one machine.
+    :param path: Database file; created if missing.
+    :param maxsize: Maximum number of responses to keep, oldest evicted first.  None means unbounded.
+    """
+
+    def __init__(self, path: str, maxsize: typing.Optional[int] = None):
+        self.path = os.path.abspath(path)
+        self.maxsize = maxsize
+        self.__local = threading.local()
+        self.__connections: typing.List[sqlite3.Connection] = []
+        self.__lock = threading.Lock()
+        with self.__connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content BLOB NOT NULL, fetched_at REAL NOT NULL, "
+                "etag TEXT, last_modified TEXT)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at)"
+            )
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection; sqlite3 connections cannot be shared between threads.
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            # WAL lets readers in other processes proceed while one process writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+    @staticmethod
+    def __serialize(key: typing.Tuple) -> str:
+        return json.dumps(key)
+
+    def __len__(self) -> int:
+        return self.__connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: typing.Tuple) -> typing.Optional[CacheEntry]:
+        row = (
+            self.__connect()
+            .execute(
+                "SELECT content, fetched_at, etag, last_modified FROM responses WHERE key = ?",
+                (self.__serialize(key),),
+            )
+            .fetchone()
+        )
+        return CacheEntry(*row) if row is not None else None
+
+    def set(self, key: typing.Tuple, entry: CacheEntry) -> None:
+        with self.__connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.__serialize(key),
+                    entry.content,
+                    entry.fetched_at,
+                    entry.etag,
+                    entry.last_modified,
+                ),
+            )
+            if self.maxsize is not None:
+                (count,) = connection.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()
+                if count > self.maxsize:
+                    # Walk the fetched_at index from the oldest end rather than sorting the whole table.
+                    connection.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY fetched_at LIMIT ?)",
+                        (count - self.maxsize,),
+                    )
+
+    def clear(self) -> None:
+        with self.__connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """
+        Close the database connections opened by every thread.
+        """
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    revalidated: int = 0
+
+
+class ResponseCache:
+    """
+    A cache backend together with its TTL table and hit/miss counters.
+
+    enable_cache() configures the one used by module-level calls; each FMPClient owns its own.
+    :param backend: Where responses are stored, or None to cache nothing.
+    :param ttls: Seconds a response stays fresh, by path prefix.  Merged over settings.CACHE_TTLS.
+    :param default_ttl: Seconds a response stays fresh for paths that match no prefix.
+    """
+
+    def __init__(
+        self,
+        backend: typing.Optional[typing.Union[MemoryCache, SQLiteCache]] = None,
+        ttls: typing.Optional[typing.Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        self.backend = backend
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.__counts = {"hits": 0, "misses": 0, "revalidated": 0}
+        self.__lock = threading.Lock()
+
+    def info(self) -> CacheInfo:
+        """
+        Report cache hits, misses and size, like functools.lru_cache's cache_info().
+        """
+        backend = self.backend
+        return CacheInfo(
+            hits=self.__counts["hits"],
+            misses=self.__counts["misses"],
+            maxsize=(backend.maxsize or 0) if backend is not None else 0,
+            currsize=len(backend) if backend is not None else 0,
+            revalidated=self.__counts["revalidated"],
+        )
+
+    def clear(self) -> None:
+        """
+        Drop every cached response and reset the hit/miss counters.
+        """
+        if self.backend is not None:
+            self.backend.clear()
+        with self.__lock:
+            self.__counts.update(hits=0, misses=0, revalidated=0)
+
+    def ttl_for(self, path: str) -> float:
+        """
+        Return the TTL of the longest prefix in the TTL table that matches path.
+        """
+        segments = path.strip("/").split("?")[0].split("/")
+        for end in range(len(segments), 0, -1):
+            ttl = self.ttls.get("/".join(segments[:end]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def cacheable(self, path: str) -> bool:
+        """
+        Whether responses from this path are cached at the moment.
+        """
+        return self.backend is not None and self.ttl_for(path) > 0
+
+    @staticmethod
+    def __key(base_url: str, path: str, query_vars: typing.Dict) -> typing.Tuple:
+        query = tuple(
+            sorted((k, str(v)) for k, v in query_vars.items() if k != "apikey")
+        )
+        return base_url, path, query
+
+    def __count(self, counter: str) -> None:
+        with self.__lock:
+            self.__counts[counter] += 1
+
+    def lookup(
+        self, base_url: str, path: str, query_vars: typing.Dict
+    ) -> typing.Tuple[typing.Optional[CacheEntry], bool]:
+        """
+        Look up the cached response for this request.  A fresh entry counts as a hit.
+
+        :return: The cached entry (or None if caching is disabled or nothing is cached) and whether it is fresh.
+        """
+        backend = self.backend
+        ttl = self.ttl_for(path)
+        if backend is None or ttl <= 0:
+            return None, False
+        entry = backend.get(self.__key(base_url, path, query_vars))
+        if entry is not None and time.time() - entry.fetched_at < ttl:
+            self.__count("hits")
+            return entry, True
+        self.__count("misses")
+        return entry, False
+
+    def revalidated(
+        self, base_url: str, path: str, query_vars: typing.Dict, entry: CacheEntry
+    ) -> None:
+        """
+        Mark a stale entry fresh again after the server answered 304 Not Modified.  Counted in revalidated.
+        """
+        backend = self.backend
+        self.__count("revalidated")
+        if backend is not None:
+            backend.set(
+                self.__key(base_url, path, query_vars),
+                dataclasses.replace(entry, fetched_at=time.time()),
+            )
+
+    def store(
+        self,
+        base_url: str,
+        path: str,
+        query_vars: typing.Dict,
+        content: bytes,
+        headers: typing.Mapping[str, str],
+    ) -> None:
+        """
+        Cache a successful response body and its validators, if caching is enabled for this endpoint.
+        """
+        backend = self.backend
+        if backend is None or self.ttl_for(path) <= 0 or len(content) == 0:
+            return
+        backend.set(
+            self.__key(base_url, path, query_vars),
+            CacheEntry(
+                content=content,
+                fetched_at=time.time(),
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+            ),
+        )
+
+
+# The cache used by module-level calls.  Disabled until enable_cache() is called.
+__cache = ResponseCache()
+
+
+def enable_cache(
+    maxsize: int = DEFAULT_CACHE_MAXSIZE,
+    ttls: typing.Optional[typing.Dict[str, float]] = None,
+    default_ttl: float = DEFAULT_CACHE_TTL,
+    backend: typing.Optional[typing.Union[MemoryCache, SQLiteCache]] = None,
+) -> None:
+    """
+    Cache successful JSON responses, in memory by default.
+
+    Responses are keyed by base URL, path and query values (ignoring apikey).  How long a response stays fresh
+    depends on its endpoint: see settings.CACHE_TTLS for the defaults, e.g. a day for symbol lists and seconds for
+    quotes.  Stale responses that came with an ETag or Last-Modified header are revalidated with a conditional
+    request, so an unchanged payload is not downloaded again.
+    :param maxsize: Maximum number of responses to keep in memory; the least recently used are evicted first.
+    :param ttls: Seconds a response stays fresh, by path prefix (e.g. {"quote": 1, "stock/list": 3600}).  Merged
+        over the defaults.  A TTL of 0 disables caching for that endpoint.
+    :param default_ttl: Seconds a response stays fresh for paths that match no prefix.
+    :param backend: Cache to use instead of a new MemoryCache, e.g. SQLiteCache("fmpsdk-cache.sqlite") for a cache
+        that survives restarts.  Its existing entries are kept.
+    """
+    global __cache
+    __cache = ResponseCache(
+        backend=backend if backend is not None else MemoryCache(maxsize=maxsize),
+        ttls=ttls,
+        default_ttl=default_ttl,
+    )
+
+
+def disable_cache() -> None:
+    """
+    Stop caching responses and drop everything cached so far.
+    """
+    __cache.backend = None
+
+
+def clear_cache() -> None:
+    """
+    Drop every cached response and reset the hit/miss counters.
+    """
+    __cache.clear()
+
+
+def cache_info() -> CacheInfo:
+    """
+    Report cache hits, misses and size, like functools.lru_cache's cache_info().
+    """
+    return __cache.info()
+
+
+def __get_cache() -> ResponseCache:
+    """
+    Return the cache used by module-level calls.
+    """
+    return __cache
+
+
+def __conditional_headers(entry: typing.Optional[CacheEntry]) -> typing.Dict[str, str]:
+    """
+    Build the headers that ask the server to answer 304 Not Modified if a stale entry is still current.
+    """
+    headers = {}
+    if entry is not None:
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+    return headers
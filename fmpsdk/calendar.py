@@ -1,22 +1,20 @@
+import logging
 import typing
 
-from .settings import DEFAULT_LIMIT
+from .fan_out import __date_windows, __iter_concurrently
+from .settings import CALENDAR_WINDOW_DAYS, DEFAULT_BATCH_WORKERS, DEFAULT_LIMIT
 from .url_methods import __return_json_v3
 
 
-def earning_calendar(
-    apikey: str, from_date: str = None, to_date: str = None
+def __calendar_request(
+    apikey: str,
+    path: str,
+    from_date: typing.Optional[str],
+    to_date: typing.Optional[str],
 ) -> typing.Optional[typing.List[typing.Dict]]:
     """
-    Query FMP /earning_calendar/ API.
-
-    Note: Between the "from" and "to" parameters the maximum time interval can be 3 months.
-    :param apikey: Your API key.
-    :param from_date: 'YYYY:MM:DD'
-    :param to_date: 'YYYY:MM:DD'
-    :return: A list of dictionaries.
+    Query one FMP calendar API for one window of dates.
     """
-    path = f"earning_calendar"
     query_vars = {
         "apikey": apikey,
     }
@@ -27,6 +25,112 @@ def earning_calendar(
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
+def __stitch_events(
+    windows: typing.Iterable[
+        typing.Tuple[typing.Dict, typing.Optional[typing.List[typing.Dict]]]
+    ],
+    failures: typing.Optional[typing.List] = None,
+) -> typing.Iterator[typing.Dict]:
+    """
+    Yield the events of consecutive windows, given newest window first, newest event first.
+
+    Events dated outside their window and repeats of an event within it are dropped, so no event is yielded twice.  A
+    window result that is not a list (None for a failed request, or an error body) is skipped: it is appended to
+    failures if given, so the caller can tell a total failure from a range without events, or else logged.
+    """
+    for call, events in windows:
+        if not isinstance(events, list):
+            if failures is not None:
+                failures.append((call, events))
+            elif events is not None:
+                logging.error(
+                    f"Unexpected {call['path']} response: {str(events)[:200]}"
+                )
+            continue
+        start = (call["from_date"] or "")[:10]
+        end = (call["to_date"] or "9999-12-31")[:10]
+        seen = set()
+        for event in sorted(events, key=lambda e: e.get("date") or "", reverse=True):
+            date = (event.get("date") or "")[:10]
+            if date and not start <= date <= end:
+                continue
+            key = repr(sorted(event.items()))
+            if key not in seen:
+                seen.add(key)
+                yield event
+
+
+def __calendar(
+    apikey: str,
+    path: str,
+    from_date: typing.Optional[str],
+    to_date: typing.Optional[str],
+    stream: bool,
+    max_workers: int,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
+    """
+    Query a calendar API for any from_date..to_date range.
+
+    Ranges longer than CALENDAR_WINDOW_DAYS are split into windows that are fetched concurrently.  Events are returned
+    newest first, without duplicates, however many windows there are.
+    :param apikey: Your API key.
+    :param path: Calendar path, e.g. "earning_calendar".
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
+    :return: A list of dictionaries.
+    """
+    windows = [(from_date, to_date)]
+    if from_date and to_date:
+        windows = __date_windows(from_date, to_date, CALENDAR_WINDOW_DAYS)
+    calls = [
+        {"apikey": apikey, "path": path, "from_date": start, "to_date": end}
+        for start, end in reversed(windows)
+    ]
+    results = __iter_concurrently(__calendar_request, calls, max_workers)
+    if stream:
+        return __stitch_events(zip(calls, results))
+    failures = []
+    events = list(__stitch_events(zip(calls, results), failures))
+    if len(failures) == len(calls):
+        # No window succeeded: a failed request or an error body, returned as is whatever the number of windows.
+        return failures[0][1]
+    for call, failure in failures:
+        if failure is not None:
+            logging.error(f"Unexpected {call['path']} response: {str(failure)[:200]}")
+    return events
+
+
+def earning_calendar(
+    apikey: str,
+    from_date: str = None,
+    to_date: str = None,
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
+    """
+    Query FMP /earning_calendar/ API.
+
+    The API answers at most 3 months between the "from" and "to" parameters; longer ranges are split into 3-month
+    windows that are fetched concurrently and merged newest event first, without duplicates.
+    :param apikey: Your API key.
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
+    :return: A list of dictionaries.
+    """
+    return __calendar(
+        apikey,
+        "earning_calendar",
+        from_date,
+        to_date,
+        stream=stream,
+        max_workers=max_workers,
+    )
+
+
 def historical_earning_calendar(
     apikey: str, symbol: str, limit: int = DEFAULT_LIMIT
 ) -> typing.Optional[typing.List[typing.Dict]]:
@@ -49,92 +153,116 @@ def historical_earning_calendar(
 
 
 def ipo_calendar(
-    apikey: str, from_date: str = None, to_date: str = None
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str,
+    from_date: str = None,
+    to_date: str = None,
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /ipo_calendar/ API.
 
-    Note: Between the "from" and "to" parameters the maximum time interval can be 3 months.
+    The API answers at most 3 months between the "from" and "to" parameters; longer ranges are split into 3-month
+    windows that are fetched concurrently and merged newest event first, without duplicates.
     :param apikey: Your API key.
-    :param from_date: 'YYYY:MM:DD'
-    :param to_date: 'YYYY:MM:DD'
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
     :return: A list of dictionaries.
     """
-    path = f"ipo_calendar"
-    query_vars = {
-        "apikey": apikey,
-    }
-    if from_date:
-        query_vars["from"] = from_date
-    if to_date:
-        query_vars["to"] = to_date
-    return __return_json_v3(path=path, query_vars=query_vars)
+    return __calendar(
+        apikey,
+        "ipo_calendar",
+        from_date,
+        to_date,
+        stream=stream,
+        max_workers=max_workers,
+    )
 
 
 def stock_split_calendar(
-    apikey: str, from_date: str = None, to_date: str = None
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str,
+    from_date: str = None,
+    to_date: str = None,
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /stock_split_calendar/ API.
 
-    Note: Between the "from" and "to" parameters the maximum time interval can be 3 months.
+    The API answers at most 3 months between the "from" and "to" parameters; longer ranges are split into 3-month
+    windows that are fetched concurrently and merged newest event first, without duplicates.
     :param apikey: Your API key.
-    :param from_date: 'YYYY:MM:DD'
-    :param to_date: 'YYYY:MM:DD'
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
     :return: A list of dictionaries.
     """
-    path = f"stock_split_calendar"
-    query_vars = {
-        "apikey": apikey,
-    }
-    if from_date:
-        query_vars["from"] = from_date
-    if to_date:
-        query_vars["to"] = to_date
-    return __return_json_v3(path=path, query_vars=query_vars)
+    return __calendar(
+        apikey,
+        "stock_split_calendar",
+        from_date,
+        to_date,
+        stream=stream,
+        max_workers=max_workers,
+    )
 
 
 def dividend_calendar(
-    apikey: str, from_date: str = None, to_date: str = None
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str,
+    from_date: str = None,
+    to_date: str = None,
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /stock_dividend_calendar/ API.
 
-    Note: Between the "from" and "to" parameters the maximum time interval can be 3 months.
+    The API answers at most 3 months between the "from" and "to" parameters; longer ranges are split into 3-month
+    windows that are fetched concurrently and merged newest event first, without duplicates.
     :param apikey: Your API key.
-    :param from_date: 'YYYY:MM:DD'
-    :param to_date: 'YYYY:MM:DD'
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
     :return: A list of dictionaries.
     """
-    path = f"stock_dividend_calendar"
-    query_vars = {
-        "apikey": apikey,
-    }
-    if from_date:
-        query_vars["from"] = from_date
-    if to_date:
-        query_vars["to"] = to_date
-    return __return_json_v3(path=path, query_vars=query_vars)
+    return __calendar(
+        apikey,
+        "stock_dividend_calendar",
+        from_date,
+        to_date,
+        stream=stream,
+        max_workers=max_workers,
+    )
 
 
 def economic_calendar(
-    apikey: str, from_date: str = None, to_date: str = None
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str,
+    from_date: str = None,
+    to_date: str = None,
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /economic_calendar/ API.
 
-    Note: Between the "from" and "to" parameters the maximum time interval can be 3 months.
+    The API answers at most 3 months between the "from" and "to" parameters; longer ranges are split into 3-month
+    windows that are fetched concurrently and merged newest event first, without duplicates.
     :param apikey: Your API key.
-    :param from_date: 'YYYY:MM:DD'
-    :param to_date: 'YYYY:MM:DD'
+    :param from_date: 'YYYY-MM-DD'
+    :param to_date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields events as their windows arrive.
+    :param max_workers: Number of windows fetched at once.
     :return: A list of dictionaries.
     """
-    path = f"economic_calendar"
-    query_vars = {
-        "apikey": apikey,
-    }
-    if from_date:
-        query_vars["from"] = from_date
-    if to_date:
-        query_vars["to"] = to_date
-    return __return_json_v3(path=path, query_vars=query_vars)
+    return __calendar(
+        apikey,
+        "economic_calendar",
+        from_date,
+        to_date,
+        stream=stream,
+        max_workers=max_workers,
+    )
@@ -0,0 +1,217 @@
+import collections.abc
+import contextvars
+import functools
+import inspect
+import typing
+
+import requests
+
+import fmpsdk
+
+from .cache import CacheInfo, MemoryCache, ResponseCache, SQLiteCache
+from .metrics import RequestEvent
+from .rate_limit import TokenBucket
+from .settings import (
+    DEFAULT_CACHE_MAXSIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_POOL_BLOCK,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    RATE_LIMIT_PLANS,
+)
+from .url_methods import RetryPolicy, __active_client, __new_session, __raise_errors
+
+# Private helpers called from a class body take a single underscore rather than the package's usual two, which would
+# be mangled there.
+
+
+def _build_session(**options) -> requests.Session:
+    """
+    Build a client's own pooled session.  See configure_session() for the options.
+    """
+    return __new_session(**options)
+
+
+def _build_rate_limiter(
+    plan: typing.Optional[str],
+    calls_per_minute: typing.Optional[float],
+    burst: typing.Optional[int],
+) -> typing.Optional[TokenBucket]:
+    """
+    Build a client's token bucket from a plan name or a custom limit.  Neither means calls are not limited.
+    """
+    if calls_per_minute is None:
+        if plan is None:
+            return None
+        if plan not in RATE_LIMIT_PLANS:
+            raise ValueError(
+                f"Invalid plan value: {plan}.  Valid options: {list(RATE_LIMIT_PLANS)}"
+            )
+        calls_per_minute = RATE_LIMIT_PLANS[plan]
+    return TokenBucket(calls_per_minute, burst)
+
+
+class FMPClient:
+    """
+    An apikey together with the resources its calls use: a pooled session, a response cache, a rate limiter, a retry
+    policy and request hooks.
+
+    Every endpoint function is available as a method with the same parameters minus apikey.  Clients share nothing
+    with each other or with module-level calls, so several keys or configurations can be used in one process:
+
+        with fmpsdk.FMPClient(apikey, plan="premium", cache=True) as client:
+            profile = client.company_profile(symbol="AAPL")
+    :param apikey: Your API key.
+    :param pool_connections: Number of per-host connection pools to keep.
+    :param pool_maxsize: Maximum number of connections kept open per host.
+    :param pool_block: If True, never open more than pool_maxsize connections to a host; callers wait instead.
+    :param keep_alive: If False, send "Connection: close" so connections are not reused.
+    :param cache: True to cache responses in memory, or a MemoryCache or SQLiteCache to use.  False caches nothing.
+    :param cache_ttls: Seconds a response stays fresh, by path prefix.  Merged over settings.CACHE_TTLS.
+    :param default_ttl: Seconds a response stays fresh for paths that match no prefix.
+    :param plan: FMP plan name, one of RATE_LIMIT_PLANS ('starter', 'premium', 'ultimate'), to limit calls to.
+    :param calls_per_minute: Custom rate limit; overrides plan.
+    :param burst: Number of calls that may be made back-to-back after an idle period.
+    :param retries: How failed requests are retried.  Defaults to RetryPolicy().
+    :param raise_errors: If True, failed requests raise FMPRequestError instead of being logged and returning None.
+    :param hooks: Callables taking a RequestEvent, called after every request made by this client.
+    """
+
+    def __init__(
+        self,
+        apikey: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = DEFAULT_POOL_BLOCK,
+        keep_alive: bool = DEFAULT_KEEP_ALIVE,
+        cache: typing.Union[bool, MemoryCache, SQLiteCache] = False,
+        cache_ttls: typing.Optional[typing.Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        plan: typing.Optional[str] = None,
+        calls_per_minute: typing.Optional[float] = None,
+        burst: typing.Optional[int] = None,
+        retries: typing.Optional[RetryPolicy] = None,
+        raise_errors: bool = False,
+        hooks: typing.Iterable[typing.Callable[[RequestEvent], typing.Any]] = (),
+    ):
+        self.apikey = apikey
+        self.session = _build_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+        )
+        if cache is True:
+            cache = MemoryCache(maxsize=DEFAULT_CACHE_MAXSIZE)
+        elif cache is False:
+            cache = None
+        self.cache = ResponseCache(
+            backend=cache, ttls=cache_ttls, default_ttl=default_ttl
+        )
+        self.rate_limiter = _build_rate_limiter(plan, calls_per_minute, burst)
+        self.retry_policy = retries if retries is not None else RetryPolicy()
+        self.raise_errors = raise_errors
+        self.hooks = list(hooks)
+
+    def __repr__(self) -> str:
+        return f"FMPClient(apikey='...{self.apikey[-4:]}')"
+
+    def __enter__(self) -> "FMPClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the client's session and all of its pooled connections.
+        """
+        self.session.close()
+
+    def add_request_hook(
+        self, hook: typing.Callable[[RequestEvent], typing.Any]
+    ) -> typing.Callable[[RequestEvent], typing.Any]:
+        """
+        Call hook with a RequestEvent after every request made by this client.
+        :return: hook, so this can be used as a decorator.
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def remove_request_hook(
+        self, hook: typing.Callable[[RequestEvent], typing.Any]
+    ) -> None:
+        """
+        Stop calling a hook registered with add_request_hook().
+        """
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report this client's cache hits, misses and size.
+        """
+        return self.cache.info()
+
+    def clear_cache(self) -> None:
+        """
+        Drop every response cached by this client and reset its hit/miss counters.
+        """
+        self.cache.clear()
+
+
+def __activate(client: FMPClient) -> None:
+    """
+    Make client's resources serve the calls made in the current context.
+    """
+    __active_client.set(client)
+    if client.raise_errors:
+        __raise_errors.set(True)
+
+
+def __iterate_in(
+    context: contextvars.Context, iterator: typing.Iterator
+) -> typing.Iterator:
+    """
+    Advance iterator inside context, so a streamed response is read with the client that started it.
+    """
+    try:
+        while True:
+            try:
+                item = context.run(next, iterator)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            context.run(close)
+
+
+def __client_method(func: typing.Callable) -> typing.Callable:
+    """
+    Build the FMPClient method of an endpoint function: the same name, parameters and docstring, minus apikey.
+    """
+    signature = inspect.signature(func)
+    parameters = list(signature.parameters.values())
+
+    @functools.wraps(func)
+    def method(self: FMPClient, *args, **kwargs):
+        context = contextvars.copy_context()
+        context.run(__activate, self)
+        result = context.run(func, self.apikey, *args, **kwargs)
+        if isinstance(result, collections.abc.Iterator):
+            return __iterate_in(context, result)
+        return result
+
+    method.__signature__ = signature.replace(
+        parameters=[inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        + parameters[1:]
+    )
+    return method
+
+
+for _name in fmpsdk.ENDPOINTS:
+    setattr(FMPClient, _name, __client_method(getattr(fmpsdk, _name)))
+del _name
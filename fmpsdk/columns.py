@@ -0,0 +1,180 @@
+import importlib.util
+import re
+import typing
+
+from .records import __to_objects
+from .settings import RESULT_FORMATS
+
+__DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+__DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?$")
+
+
+def __validate_format(value: str, objects: bool = False) -> str:
+    """
+    Check that a result format is known and that the packages it needs are installed.
+    :param value: Format name.
+    :param objects: True if the endpoint has a record class, so 'objects' is valid too.
+    :return: Passed value.
+    """
+    valid = RESULT_FORMATS if objects else [f for f in RESULT_FORMATS if f != "objects"]
+    if value not in valid:
+        raise ValueError(f"Invalid format value: {value}.  Valid options: {valid}")
+    # numpy and pyarrow are imported where they are used: they take far longer to import than fmpsdk itself.
+    if value in ("columns", "arrow") and importlib.util.find_spec("numpy") is None:
+        raise ImportError(
+            f"format='{value}' requires numpy.  Install it with 'pip install fmpsdk[columns]'."
+        )
+    if value == "arrow" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            "format='arrow' requires pyarrow.  Install it with 'pip install fmpsdk[arrow]'."
+        )
+    return value
+
+
+def __column_array(values: typing.List) -> "numpy.ndarray":
+    """
+    Convert one column's values to the narrowest NumPy array that holds them.
+
+    Integers become int64 (float64 if some are missing), numbers float64 with NaN for missing values, booleans bool,
+    ISO dates datetime64[D] and ISO date-times datetime64[s] with NaT for missing values.  Anything else stays an
+    object array.
+    """
+    import numpy
+
+    kinds = set(map(type, values))
+    missing = type(None) in kinds
+    kinds.discard(type(None))
+    try:
+        if kinds == {bool} and not missing:
+            return numpy.array(values, dtype=bool)
+        if kinds == {int} and not missing:
+            return numpy.array(values, dtype=numpy.int64)
+        if kinds and kinds <= {int, float}:
+            return numpy.array(
+                [numpy.nan if value is None else value for value in values],
+                dtype=numpy.float64,
+            )
+    except OverflowError:
+        pass
+    if kinds == {str}:
+        strings = [value for value in values if value is not None]
+        if all(__DATE.match(value) for value in strings):
+            return numpy.array(values, dtype="datetime64[D]")
+        if all(__DATETIME.match(value) for value in strings):
+            return numpy.array(values, dtype="datetime64[s]")
+    # Share one object between equal strings; columns like exchange or type repeat a handful of values.
+    unique: typing.Dict = {}
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = [
+        unique.setdefault(value, value) if type(value) is str else value
+        for value in values
+    ]
+    return array
+
+
+def __to_columns(records: typing.Iterable[typing.Dict], format: str) -> typing.Any:
+    """
+    Collect records into typed columns without keeping the records themselves.
+
+    :param records: Dictionaries, e.g. a decoded response or a streamed one.  Fields missing from a record are
+        treated as missing values.
+    :param format: "columns" for a NumPy structured array or "arrow" for a pyarrow.Table.
+    :return: The columns, in the order their fields first appeared.
+    """
+    values: typing.Dict[str, typing.List] = {}
+    count = 0
+    for record in records:
+        for name, value in record.items():
+            column = values.get(name)
+            if column is None:
+                column = values[name] = [None] * count
+            column.append(value)
+        count += 1
+        if len(record) < len(values):
+            for column in values.values():
+                if len(column) < count:
+                    column.append(None)
+
+    import numpy
+
+    columns = {}
+    for name in list(values):
+        # Free each column's Python objects as soon as it is converted.
+        columns[name] = __column_array(values.pop(name))
+    if format == "arrow":
+        import pyarrow
+
+        return pyarrow.table(
+            {name: __arrow_array(column) for name, column in columns.items()}
+        )
+    table = numpy.empty(
+        count, dtype=[(name, column.dtype) for name, column in columns.items()]
+    )
+    for name, column in columns.items():
+        table[name] = column
+    return table
+
+
+def __arrow_array(column: typing.Any) -> typing.Any:
+    """
+    Convert a column made by __column_array to a pyarrow.Array.
+
+    An object column whose values mix types (e.g. a number the API sometimes sends as a string) becomes a string
+    column, with missing values kept as nulls.
+    """
+    import pyarrow
+
+    try:
+        return pyarrow.array(column, from_pandas=True)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        return pyarrow.array(
+            [None if value is None else str(value) for value in column],
+            type=pyarrow.string(),
+        )
+
+
+def __columns_from_stream(
+    stream: typing.Iterator[typing.Dict], format: str
+) -> typing.Any:
+    """
+    Collect a streamed response (see url_methods.__iter_json) into columns.
+    :return: The columns.  Like format='records', None if the request failed and the body itself if it was not a
+        list, e.g. an error message.
+    """
+    outcome = []
+    last = []
+
+    def records() -> typing.Iterator[typing.Dict]:
+        while True:
+            try:
+                record = next(stream)
+            except StopIteration as stop:
+                outcome.append(stop.value)
+                return
+            last[:] = [record]
+            yield record
+
+    columns = __to_columns(records(), format)
+    if outcome == [False]:
+        return last[0] if last else None
+    return columns
+
+
+def __format_result(
+    records: typing.Union[typing.Iterable[typing.Dict], typing.Dict, None],
+    format: str,
+    record_class: typing.Optional[type] = None,
+    symbol: typing.Optional[str] = None,
+) -> typing.Any:
+    """
+    Return records in the requested result format.
+
+    None (a failed request) and a dictionary (an error body such as {"Error Message": ...}) are returned as is.
+    :param record_class: Class from records.py that format='objects' builds.
+    :param symbol: Symbol for objects whose records do not carry one.
+    """
+    if format == "records" or records is None or isinstance(records, dict):
+        return records
+    if format == "objects":
+        return __to_objects(records, record_class, symbol)
+    return __to_columns(records, format)
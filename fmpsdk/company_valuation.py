@@ -1,8 +1,9 @@
 import logging
 import typing
+import zipfile
 
-import requests
-
+from .archives import StatementArchive
+from .columns import __columns_from_stream, __validate_format
 from .settings import (
     BALANCE_SHEET_STATEMENT_AS_REPORTED_FILENAME,
     BALANCE_SHEET_STATEMENT_FILENAME,
@@ -12,9 +13,11 @@ from .settings import (
     FINANCIAL_STATEMENT_FILENAME,
     INCOME_STATEMENT_AS_REPORTED_FILENAME,
     INCOME_STATEMENT_FILENAME,
-    BASE_URL_v3,
 )
 from .url_methods import (
+    __download_v3,
+    __iter_json_v3,
+    __return_content_v3,
     __return_json_v3,
     __return_json_v4,
     __validate_industry,
@@ -102,8 +105,11 @@ def search_ticker(
 
 
 def financial_statement(
-    apikey: str, symbol: str, filename: str = FINANCIAL_STATEMENT_FILENAME
-) -> None:
+    apikey: str,
+    symbol: str,
+    filename: str = FINANCIAL_STATEMENT_FILENAME,
+    in_memory: bool = False,
+) -> typing.Optional[StatementArchive]:
     """
     Query FMP /financial-statements/ API.
 
@@ -111,15 +117,24 @@ def financial_statement(
     :param apikey: Your API key.
     :param symbol: Ticker of company.
     :param filename: Name of saved file.
-    :return: A list of dictionaries.
+    :param in_memory: If True, return the archive instead of saving it; its members are parsed when accessed.
+    :return: A StatementArchive mapping member names to lists of dictionaries if in_memory, else None.
     """
     path = f"financial-statements/{symbol}"
     query_vars = {
         "apikey": apikey,
         "datatype": "zip",  # Only ZIP format is supported.
     }
-    response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-    open(filename, "wb").write(response.content)
+    if in_memory:
+        content = __return_content_v3(path=path, query_vars=query_vars)
+        if content is None:
+            return None
+        try:
+            return StatementArchive(content)
+        except zipfile.BadZipFile:
+            logging.error(f"Response to {path} is not a ZIP archive: {content[:200]!r}")
+            return None
+    __download_v3(path=path, query_vars=query_vars, filename=filename)
     logging.info(f"Saving {symbol} financial statement as {filename}.")
 
 
@@ -147,8 +162,7 @@ def income_statement(
     query_vars = {"apikey": apikey, "limit": limit, "period": __validate_period(period)}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -178,8 +192,7 @@ def balance_sheet_statement(
     query_vars = {"apikey": apikey, "limit": limit, "period": __validate_period(period)}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -209,8 +222,7 @@ def cash_flow_statement(
     query_vars = {"apikey": apikey, "limit": limit, "period": __validate_period(period)}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -321,8 +333,7 @@ def income_statement_as_reported(
     }
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -356,8 +367,7 @@ def balance_sheet_statement_as_reported(
     }
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -391,8 +401,7 @@ def cash_flow_statement_as_reported(
     }
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving {symbol} financial statement as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -663,15 +672,28 @@ def historical_market_capitalization(
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
-def symbols_list(apikey: str) -> typing.Optional[typing.List[typing.Dict]]:
+def symbols_list(
+    apikey: str, stream: bool = False, format: str = "records"
+) -> typing.Union[
+    typing.List[typing.Dict], typing.Iterator[typing.Dict], typing.Any, None
+]:
     """
     Query FMP /stock/list/ API
 
     :param apikey: Your API key.
+    :param stream: If True, return an iterator that yields records one at a time as they are downloaded.
+    :param format: 'records' for a list of dictionaries, 'columns' for a NumPy structured array or 'arrow' for an
+        Arrow table.  Columns are filled as the response is downloaded.  Ignored if stream is True.
     :return: A list of dictionaries.
     """
     path = f"stock/list"
     query_vars = {"apikey": apikey}
+    if stream:
+        return __iter_json_v3(path=path, query_vars=query_vars)
+    if __validate_format(format) != "records":
+        return __columns_from_stream(
+            __iter_json_v3(path=path, query_vars=query_vars), format
+        )
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
@@ -689,17 +711,30 @@ def etf_list(apikey: str) -> typing.Optional[typing.List[typing.Dict]]:
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
-def available_traded_list(apikey: str) -> typing.Optional[typing.List[typing.Dict]]:
+def available_traded_list(
+    apikey: str, stream: bool = False, format: str = "records"
+) -> typing.Union[
+    typing.List[typing.Dict], typing.Iterator[typing.Dict], typing.Any, None
+]:
     """
     Query FMP /available-traded/list/ API
 
     All tradable symbols
 
     :param apikey: Your API key.
+    :param stream: If True, return an iterator that yields records one at a time as they are downloaded.
+    :param format: 'records' for a list of dictionaries, 'columns' for a NumPy structured array or 'arrow' for an
+        Arrow table.  Columns are filled as the response is downloaded.  Ignored if stream is True.
     :return: A list of dictionaries.
     """
     path = f"available-traded/list"
     query_vars = {"apikey": apikey}
+    if stream:
+        return __iter_json_v3(path=path, query_vars=query_vars)
+    if __validate_format(format) != "records":
+        return __columns_from_stream(
+            __iter_json_v3(path=path, query_vars=query_vars), format
+        )
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
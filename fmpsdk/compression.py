@@ -0,0 +1,115 @@
+import re
+import threading
+import typing
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Content codings requested from the server, best first.  Brotli is only offered when a decoder is installed, which
+# is also when urllib3 decodes it for the synchronous session.
+ACCEPT_ENCODING: str = ", ".join(
+    (["br"] if brotli is not None else []) + ["gzip", "deflate"]
+)
+
+
+class TransferStats(typing.NamedTuple):
+    """
+    Bytes moved for one endpoint: compressed is what crossed the wire, decompressed is what was parsed or saved.
+    """
+
+    responses: int
+    compressed_bytes: int
+    decompressed_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        """
+        How many times smaller the responses were on the wire.
+        """
+        return (
+            self.decompressed_bytes / self.compressed_bytes
+            if self.compressed_bytes
+            else 1.0
+        )
+
+
+__transfers: typing.Dict[str, TransferStats] = {}
+__transfers_lock = threading.Lock()
+# A path segment that names a symbol, a list of symbols or a CIK rather than part of the endpoint.
+__ARGUMENT_SEGMENT = re.compile(r"^(?=.*[A-Z0-9^=])[A-Z0-9.,^=\-_]+$")
+
+
+def transfer_stats() -> typing.Dict[str, TransferStats]:
+    """
+    Report compressed and decompressed response bytes per endpoint since the last reset.
+
+    Endpoints are named by their path without symbols, e.g. "historical-price-full" or "stock/list".
+    """
+    with __transfers_lock:
+        return dict(__transfers)
+
+
+def reset_transfer_stats() -> None:
+    """
+    Forget the byte counts reported by transfer_stats().
+    """
+    with __transfers_lock:
+        __transfers.clear()
+
+
+def __endpoint_name(path: str) -> str:
+    """
+    Name the endpoint a request path belongs to by dropping its query and symbol segments.
+    """
+    segments = path.split("?")[0].strip("/").split("/")
+    kept = [segment for segment in segments if not __ARGUMENT_SEGMENT.match(segment)]
+    return "/".join(kept or segments[:1])
+
+
+def __record_transfer(
+    path: str, compressed_bytes: int, decompressed_bytes: int
+) -> None:
+    """
+    Add one response's sizes to its endpoint's transfer stats.
+    """
+    endpoint = __endpoint_name(path)
+    with __transfers_lock:
+        stats = __transfers.get(endpoint, TransferStats(0, 0, 0))
+        __transfers[endpoint] = TransferStats(
+            responses=stats.responses + 1,
+            compressed_bytes=stats.compressed_bytes + compressed_bytes,
+            decompressed_bytes=stats.decompressed_bytes + decompressed_bytes,
+        )
+
+
+def __decompress(content: bytes, content_encoding: typing.Optional[str]) -> bytes:
+    """
+    Undo the Content-Encoding of a response body read without automatic decompression.
+
+    :param content: Body as received.
+    :param content_encoding: The response's Content-Encoding header, listing codings in the order they were applied.
+    :return: The decoded body.
+    """
+    if not content_encoding:
+        return content
+    for coding in reversed(content_encoding.lower().split(",")):
+        coding = coding.strip()
+        if coding in ("gzip", "x-gzip"):
+            content = zlib.decompress(content, wbits=zlib.MAX_WBITS | 16)
+        elif coding == "deflate":
+            try:
+                content = zlib.decompress(content)
+            except zlib.error:
+                # Some servers send a raw deflate stream without the zlib header.
+                content = zlib.decompress(content, wbits=-zlib.MAX_WBITS)
+        elif coding == "br" and brotli is not None:
+            content = brotli.decompress(content)
+        elif coding not in ("", "identity"):
+            raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+    return content
@@ -0,0 +1,68 @@
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def __orjson_loads(content: bytes) -> typing.Any:
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than the standard library (e.g. it rejects NaN and integers wider than 64 bits), so give
+        # the standard library a chance before reporting the body as invalid.
+        return json.loads(content)
+
+
+__BACKENDS: typing.Dict[str, typing.Optional[typing.Callable[[bytes], typing.Any]]] = {
+    "orjson": __orjson_loads if orjson is not None else None,
+    "json": json.loads,
+}
+__loads: typing.Callable[[bytes], typing.Any] = __BACKENDS["orjson"] or json.loads
+__decoder_name: str = "orjson" if orjson is not None else "json"
+
+
+def set_json_decoder(
+    decoder: typing.Union[str, typing.Callable[[bytes], typing.Any], None] = None,
+) -> None:
+    """
+    Choose how response bodies are parsed.
+
+    Bodies are parsed straight from the raw bytes, without decoding them to text first.  By default orjson is used if
+    it is installed ('pip install fmpsdk[fast]') and the standard library's json module otherwise.
+    :param decoder: "orjson", "json", a callable that takes bytes and returns the parsed document, or None to restore
+        the default.
+    """
+    global __loads, __decoder_name
+    if decoder is None:
+        decoder = "orjson" if orjson is not None else "json"
+    if callable(decoder):
+        __loads = decoder
+        __decoder_name = getattr(decoder, "__qualname__", repr(decoder))
+        return
+    if decoder not in __BACKENDS:
+        raise ValueError(
+            f"Invalid decoder value: {decoder}.  Valid options: {list(__BACKENDS)}"
+        )
+    if __BACKENDS[decoder] is None:
+        raise ImportError(
+            f"The {decoder} decoder is not installed.  Install it with 'pip install fmpsdk[fast]'."
+        )
+    __loads = __BACKENDS[decoder]
+    __decoder_name = decoder
+
+
+def json_decoder() -> str:
+    """
+    Name the decoder currently used to parse response bodies.
+    """
+    return __decoder_name
+
+
+def __loads_json(content: bytes) -> typing.Any:
+    """
+    Parse a JSON document from raw bytes with the configured decoder.
+    """
+    return __loads(content)
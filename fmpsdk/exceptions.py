@@ -0,0 +1,33 @@
+import typing
+
+
+class FMPError(Exception):
+    """
+    Base class for errors raised by fmpsdk.
+    """
+
+
+class FMPRequestError(FMPError):
+    """
+    A request to the FMP API failed.
+
+    :param message: Description of the failure.
+    :param url: URL that was requested.
+    :param status_code: HTTP status code, if a response was received.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        url: typing.Optional[str] = None,
+        status_code: typing.Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+
+
+class FMPRateLimitError(FMPRequestError):
+    """
+    The FMP API rejected a request because the apikey's rate limit was exceeded (HTTP 429).
+    """
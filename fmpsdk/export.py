@@ -0,0 +1,134 @@
+import dataclasses
+import logging
+import os
+import time
+import typing
+
+from . import company_valuation
+from .fan_out import __call_each
+from .settings import (
+    DEFAULT_BATCH_WORKERS,
+    DEFAULT_LIMIT,
+    EXPORT_STATEMENTS,
+    PERIOD_VALUES,
+)
+
+
+@dataclasses.dataclass
+class ExportSummary:
+    """
+    Outcome of an export_statements() call.
+
+    downloaded and skipped list the paths written and the paths that were already fresh; errors holds the exception
+    for every path that could not be downloaded.
+    """
+
+    downloaded: typing.List[str] = dataclasses.field(default_factory=list)
+    skipped: typing.List[str] = dataclasses.field(default_factory=list)
+    errors: typing.Dict[str, BaseException] = dataclasses.field(default_factory=dict)
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.downloaded) / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Exported {len(self.downloaded)} files ({self.bytes / 1e6:.1f} MB) in {self.seconds:.1f}s: "
+            f"{self.files_per_second:.1f} files/s, {self.bytes_per_second / 1e6:.2f} MB/s.  "
+            f"{len(self.skipped)} already fresh, {len(self.errors)} failed."
+        )
+
+
+def __is_fresh(filename: str, max_age: typing.Optional[float]) -> bool:
+    """
+    Whether filename exists and, if max_age is set, was written less than max_age seconds ago.
+    """
+    try:
+        modified = os.path.getmtime(filename)
+    except OSError:
+        return False
+    return max_age is None or time.time() - modified < max_age
+
+
+def export_statements(
+    apikey: str,
+    symbols: typing.Iterable[str],
+    statements: typing.Iterable[str] = EXPORT_STATEMENTS,
+    period: str = "annual",
+    directory: str = ".",
+    limit: int = DEFAULT_LIMIT,
+    max_age: typing.Optional[float] = None,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> ExportSummary:
+    """
+    Download statements as CSV for many symbols on a thread pool, into {directory}/{statement}/{period}/{symbol}.csv.
+
+    Files that already exist and are younger than max_age are skipped, so an interrupted export can simply be run
+    again.  Failures are collected rather than raised, and a summary is logged when the export ends.
+    Example: fmpsdk.export_statements(apikey, symbols, statements=["income_statement"], directory="warehouse")
+    :param apikey: Your API key.
+    :param symbols: Tickers to export.  Duplicates are exported once.
+    :param statements: Statement function names, from settings.EXPORT_STATEMENTS.
+    :param period: 'quarter' or 'annual'.
+    :param directory: Root directory of the export; created if missing.
+    :param limit: Number of rows per statement.
+    :param max_age: Seconds after which an existing file is downloaded again.  None keeps existing files forever.
+    :param max_workers: Number of downloads in flight at once.  The shared connection pool is grown to match.
+    :return: ExportSummary of the files downloaded, skipped and failed, and the throughput.
+    """
+    statements = list(dict.fromkeys(statements))
+    for statement in statements:
+        if statement not in EXPORT_STATEMENTS:
+            raise ValueError(
+                f"Invalid statement value: {statement}.  Valid options: {list(EXPORT_STATEMENTS)}"
+            )
+    if period not in PERIOD_VALUES:
+        raise ValueError(
+            f"Invalid period value: {period}.  Valid options: {PERIOD_VALUES}"
+        )
+    symbols = list(dict.fromkeys(symbols))
+
+    summary = ExportSummary()
+    jobs = {}
+    for statement in statements:
+        statement_directory = os.path.join(directory, statement, period)
+        os.makedirs(statement_directory, exist_ok=True)
+        for symbol in symbols:
+            filename = os.path.join(statement_directory, f"{symbol}.csv")
+            if __is_fresh(filename, max_age):
+                summary.skipped.append(filename)
+            else:
+                jobs[filename] = (getattr(company_valuation, statement), symbol)
+
+    started = time.perf_counter()
+    calls = {
+        filename: (
+            func,
+            {
+                "apikey": apikey,
+                "symbol": symbol,
+                "period": period,
+                "limit": limit,
+                "download": True,
+                "filename": filename,
+            },
+        )
+        for filename, (func, symbol) in jobs.items()
+    }
+    for filename, _, error in __call_each(calls, max_workers):
+        if error is None:
+            summary.downloaded.append(filename)
+            summary.bytes += os.path.getsize(filename)
+        else:
+            summary.errors[filename] = error
+    summary.seconds = time.perf_counter() - started
+    logging.info(str(summary))
+    for filename, error in summary.errors.items():
+        logging.warning(f"Could not export {filename}: {error}")
+    return summary
@@ -0,0 +1,278 @@
+import collections
+import concurrent.futures
+import contextvars
+import dataclasses
+import datetime
+import itertools
+import logging
+import typing
+
+from .settings import DEFAULT_BATCH_WORKERS, MAX_SYMBOL_LIST_LENGTH
+from .url_methods import (
+    DeferredRequest,
+    __deferred_responses,
+    __ensure_pool_maxsize,
+    __raise_errors,
+)
+
+
+@dataclasses.dataclass
+class BatchResult:
+    """
+    Outcome of a batch() call.
+
+    results holds the return value for every symbol that succeeded and errors the exception for every symbol that
+    failed.  Both are ordered like the symbols passed to batch().
+    """
+
+    results: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    errors: typing.Dict[str, BaseException] = dataclasses.field(default_factory=dict)
+
+
+def __call_raising(func: typing.Callable, kwargs: typing.Dict) -> typing.Any:
+    """
+    Call func with request failures raised as FMPRequestError instead of being logged and returned as None.
+    """
+    __raise_errors.set(True)
+    return func(**kwargs)
+
+
+def __ensure_pool_for(func: typing.Callable, max_workers: int) -> None:
+    """
+    Grow the pool of the session func's calls will use so max_workers of them can each keep a connection.
+
+    That is the session of the FMPClient func is a method of, e.g. batch(client.quote, ...), or else the active one.
+    """
+    from .client import FMPClient, __activate
+
+    context = contextvars.copy_context()
+    client = getattr(func, "__self__", None)
+    if isinstance(client, FMPClient):
+        context.run(__activate, client)
+    context.run(__ensure_pool_maxsize, max_workers)
+
+
+def batch(
+    func: typing.Callable,
+    symbols: typing.Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    symbol_arg: str = "symbol",
+    **kwargs,
+) -> BatchResult:
+    """
+    Call a per-symbol endpoint function for many symbols on a thread pool.
+
+    Example: fmpsdk.batch(fmpsdk.key_metrics, symbols=symbols, apikey=apikey, period="quarter")
+    :param func: Endpoint function, e.g. fmpsdk.key_metrics.
+    :param symbols: Symbols to query.  Duplicates are queried once.
+    :param max_workers: Number of calls in flight at once.  The pool of the session used (func's FMPClient's, or the
+        shared one) is grown to match.
+    :param symbol_arg: Name of func's parameter that takes the symbol (e.g. "cik_id" for fmpsdk.form_13f).
+    :param kwargs: Other arguments passed to every call, including apikey.
+    :return: BatchResult with results and errors keyed by symbol.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    outcomes = {
+        symbol: (result, error)
+        for symbol, result, error in __call_each(
+            {symbol: (func, {**kwargs, symbol_arg: symbol}) for symbol in symbols},
+            max_workers,
+        )
+    }
+    batch_result = BatchResult()
+    for symbol in symbols:
+        result, error = outcomes[symbol]
+        if error is None:
+            batch_result.results[symbol] = result
+        else:
+            batch_result.errors[symbol] = error
+    return batch_result
+
+
+def __call_each(
+    calls: typing.Dict[typing.Hashable, typing.Tuple[typing.Callable, typing.Dict]],
+    max_workers: int,
+) -> typing.Iterator[
+    typing.Tuple[typing.Hashable, typing.Any, typing.Optional[BaseException]]
+]:
+    """
+    Make every call on a thread pool, with request failures raised, and yield each outcome as it completes.
+
+    Each call runs in a copy of the caller's context, so an FMPClient's resources apply.  The outcomes are yielded on
+    the caller's thread, so they can be handled without locking.
+    :param calls: (func, kwargs) of each call, by a key identifying it.
+    :param max_workers: Number of calls in flight at once.  The pool of the session used is grown to match.
+    :return: Iterator of (key, result, exception) tuples, in completion order; exception is None if the call
+        succeeded and result is None if it failed.
+    """
+    for func in {id(func): func for func, _ in calls.values()}.values():
+        __ensure_pool_for(func, max_workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run, __call_raising, func, kwargs
+            ): key
+            for key, (func, kwargs) in calls.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            error = future.exception()
+            yield futures.pop(future), None if error else future.result(), error
+
+
+def __symbol_chunks(
+    symbols: typing.Union[str, typing.List[str]], max_symbols: int
+) -> typing.List[typing.List[str]]:
+    """
+    Split symbols into lists short enough to be joined into one request path.
+    :param symbols: A list of symbols or a comma-separated string of them.  Duplicates are dropped.
+    :param max_symbols: Most symbols per list.
+    :return: Lists of symbols, in input order.
+    """
+    if type(symbols) is str:
+        symbols = symbols.split(",")
+    chunks: typing.List[typing.List[str]] = []
+    length = 0
+    for symbol in dict.fromkeys(symbols):
+        if (
+            not chunks
+            or len(chunks[-1]) >= max_symbols
+            or length + len(symbol) + 1 > MAX_SYMBOL_LIST_LENGTH
+        ):
+            chunks.append([])
+            length = 0
+        chunks[-1].append(symbol)
+        length += len(symbol) + 1
+    return chunks
+
+
+def __map_concurrently(
+    func: typing.Callable, calls: typing.List[typing.Dict], max_workers: int
+) -> typing.List:
+    """
+    Call func(**kwargs) for every kwargs in calls on a thread pool and return the results in order.
+
+    Each call runs in a copy of the caller's context, so an FMPClient's resources and raise_errors apply.  Under
+    fmpsdk.aio the calls are replayed inline and their deferred requests raised together, so the event loop performs
+    them concurrently instead.
+    :param func: Function making one request.
+    :param calls: Keyword arguments of each call.
+    :param max_workers: Number of calls in flight at once.  The shared connection pool is grown to match.
+    :return: func's results, ordered like calls.  Exceptions raised by a call propagate.
+    """
+    if len(calls) <= 1:
+        return [func(**kwargs) for kwargs in calls]
+    if __deferred_responses.get() is not None:
+        results = []
+        pending = []
+        for kwargs in calls:
+            try:
+                results.append(func(**kwargs))
+            except DeferredRequest as e:
+                pending.extend(e.pending)
+        if pending:
+            raise DeferredRequest(pending)
+        return results
+    max_workers = min(max_workers, len(calls))
+    __ensure_pool_for(func, max_workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, func, **kwargs)
+            for kwargs in calls
+        ]
+    return [future.result() for future in futures]
+
+
+def __iter_concurrently(
+    func: typing.Callable, calls: typing.List[typing.Dict], max_workers: int
+) -> typing.Iterator:
+    """
+    Like __map_concurrently, but yield the results in order as they arrive, with at most max_workers calls running or
+    finished ahead of the consumer, so only that many results are held at once.
+    """
+    if len(calls) <= 1 or __deferred_responses.get() is not None:
+        return iter(__map_concurrently(func, calls, max_workers))
+    return __submit_ahead(func, calls, min(max_workers, len(calls)))
+
+
+def __submit_ahead(
+    func: typing.Callable, calls: typing.List[typing.Dict], max_workers: int
+) -> typing.Iterator:
+    """
+    Generator behind __iter_concurrently.
+    """
+    __ensure_pool_for(func, max_workers)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    calls = iter(calls)
+    futures = collections.deque()
+    try:
+        for kwargs in itertools.islice(calls, max_workers):
+            futures.append(
+                executor.submit(contextvars.copy_context().run, func, **kwargs)
+            )
+        while futures:
+            result = futures.popleft().result()
+            kwargs = next(calls, None)
+            if kwargs is not None:
+                futures.append(
+                    executor.submit(contextvars.copy_context().run, func, **kwargs)
+                )
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def __date_windows(
+    from_date: str, to_date: str, days: int
+) -> typing.List[typing.Tuple[str, str]]:
+    """
+    Split the inclusive range from_date..to_date into consecutive windows of at most days days, oldest first.
+    :param from_date: 'YYYY-MM-DD' (a time after the date is ignored).
+    :param to_date: 'YYYY-MM-DD' (a time after the date is ignored).
+    :param days: Most days per window.
+    :return: (from, to) 'YYYY-MM-DD' pairs, or just (from_date, to_date) as passed if the range needs no splitting.
+    """
+    start = datetime.date.fromisoformat(from_date[:10])
+    end = datetime.date.fromisoformat(to_date[:10])
+    windows = []
+    while start <= end:
+        stop = min(start + datetime.timedelta(days=days - 1), end)
+        windows.append((start.isoformat(), stop.isoformat()))
+        start = stop + datetime.timedelta(days=1)
+    if len(windows) <= 1:
+        return [(from_date, to_date)]
+    return windows
+
+
+def __merge_by_symbol(
+    symbols: typing.List[str],
+    results: typing.List[typing.Any],
+    endpoint: str,
+) -> typing.Any:
+    """
+    Merge the records of several multi-symbol requests into input order and log the symbols nothing came back for.
+
+    A result that is not a list (None for a failed request, or an error body such as {"Error Message": ...}) counts
+    as a failed request: it is logged and skipped.
+    :param symbols: Symbols requested, in the order the caller gave them.
+    :param results: Each request's records.
+    :param endpoint: Endpoint name for the log message.
+    :return: The merged records.  If no request returned a list, the first result as is, like an unsplit call.
+    """
+    lists = [result for result in results if isinstance(result, list)]
+    if not lists:
+        return results[0] if results else None
+    for result in results:
+        if result is not None and not isinstance(result, list):
+            logging.error(f"Unexpected {endpoint} response: {str(result)[:200]}")
+    order = {symbol.upper(): i for i, symbol in enumerate(dict.fromkeys(symbols))}
+    records = [record for result in lists for record in result]
+    # Stable, so the records of one symbol keep the server's order.
+    records.sort(key=lambda record: order.get(record.get("symbol", ""), len(order)))
+    missing = order.keys() - {record.get("symbol") for record in records}
+    if missing:
+        missing = sorted(missing, key=order.get)
+        shown = ", ".join(missing[:20]) + (", ..." if len(missing) > 20 else "")
+        logging.warning(
+            f"No {endpoint} results for {len(missing)} of {len(order)} symbols: {shown}"
+        )
+    return records
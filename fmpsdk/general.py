@@ -1,6 +1,22 @@
+import logging
 import typing
 
-from .settings import DEFAULT_LINE_PARAMETER
+from .columns import __format_result, __validate_format
+from .fan_out import (
+    __date_windows,
+    __iter_concurrently,
+    __map_concurrently,
+    __merge_by_symbol,
+    __symbol_chunks,
+)
+from .records import Bar, IntradayBar, Quote
+from .settings import (
+    DEFAULT_BATCH_WORKERS,
+    DEFAULT_LINE_PARAMETER,
+    HISTORICAL_CHART_WINDOW_DAYS,
+    HISTORICAL_SYMBOLS_PER_REQUEST,
+    QUOTE_SYMBOLS_PER_REQUEST,
+)
 from .url_methods import __return_json_v3, __validate_series_type, __validate_time_delta
 
 
@@ -18,25 +34,102 @@ def __quotes(apikey: str, value: str) -> typing.Optional[typing.List[typing.Dict
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
-def quote(
-    apikey: str, symbol: typing.Union[str, typing.List[str]]
+def __quote_request(
+    apikey: str, symbols: typing.List[str]
 ) -> typing.Optional[typing.List[typing.Dict]]:
+    """
+    Query FMP Quote API for one URL-sized list of symbols.
+    """
+    path = f"quote/{','.join(symbols)}"
+    query_vars = {"apikey": apikey}
+    return __return_json_v3(path=path, query_vars=query_vars)
+
+
+def quote(
+    apikey: str,
+    symbol: typing.Union[str, typing.List[str]],
+    format: str = "records",
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.List[Quote], typing.Any, None]:
     """
     Query FMP Quote API.
 
-    This API endpoint is a multifunction tool!
+    This API endpoint is a multifunction tool!  Long symbol lists are split into requests of at most
+    QUOTE_SYMBOLS_PER_REQUEST symbols that run concurrently; their quotes are merged in input order and symbols with no
+    quote are logged.
 
     :param apikey: Your API key
     :param symbol: The Ticker(s), Index(es), Commodity(ies), etc. symbol to query for.
+    :param format: 'records' for a list of dictionaries, 'objects' for a list of Quote, 'columns' for a NumPy
+        structured array or 'arrow' for an Arrow table.
+    :param max_workers: Number of requests in flight at once when the symbols are split.
     :return: A list of dictionaries.
     """
-    if type(symbol) is list:
-        symbol = ",".join(symbol)
-    path = f"quote/{symbol}"
-    query_vars = {"apikey": apikey}
+    __validate_format(format, objects=True)
+    chunks = __symbol_chunks(symbol, QUOTE_SYMBOLS_PER_REQUEST)
+    results = __map_concurrently(
+        __quote_request,
+        [{"apikey": apikey, "symbols": chunk} for chunk in chunks],
+        max_workers,
+    )
+    if len(chunks) == 1 and len(chunks[0]) == 1:
+        records = results[0]
+    else:
+        records = __merge_by_symbol(sum(chunks, []), results, "quote")
+    return __format_result(records, format, Quote)
+
+
+def __historical_chart_request(
+    apikey: str,
+    symbol: str,
+    time_delta: str,
+    from_date: typing.Optional[str],
+    to_date: typing.Optional[str],
+    time_series: typing.Optional[str],
+) -> typing.Optional[typing.List[typing.Dict]]:
+    """
+    Query FMP Historical Chart API for one window of bars.
+    """
+    path = f"historical-chart/{time_delta}/{symbol}"
+    query_vars = {
+        "apikey": apikey,
+    }
+    if time_series:
+        query_vars["timeseries"] = time_series
+    if from_date:
+        query_vars["from"] = from_date
+    if to_date:
+        query_vars["to"] = to_date
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
+def __stitch_bars(
+    windows: typing.Iterable[typing.Optional[typing.List[typing.Dict]]],
+    failures: typing.Optional[typing.List] = None,
+) -> typing.Iterator[typing.Dict]:
+    """
+    Yield the bars of consecutive windows, given newest window first, newest bar first and each date once.
+
+    A window result that is not a list (None for a failed request, or an error body) is skipped: it is appended to
+    failures if given, so the caller can tell a total failure from a range without bars, or else logged.
+    """
+    last = None
+    for bars in windows:
+        if not isinstance(bars, list):
+            if failures is not None:
+                failures.append(bars)
+            elif bars is not None:
+                logging.error(
+                    f"Unexpected historical_chart response: {str(bars)[:200]}"
+                )
+            continue
+        for bar in sorted(bars, key=lambda bar: bar["date"], reverse=True):
+            # Windows meet at a date boundary, so a bar repeated by the next window is never newer than the last one.
+            if last is None or bar["date"] < last:
+                last = bar["date"]
+                yield bar
+
+
 def historical_chart(
     apikey: str,
     symbol: str,
@@ -44,11 +137,18 @@ def historical_chart(
     from_date: str,
     to_date: str,
     time_series: str = DEFAULT_LINE_PARAMETER,
-) -> typing.Optional[typing.List[typing.Dict]]:
+    format: str = "records",
+    stream: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[
+    typing.List[typing.Dict], typing.Iterator[typing.Dict], typing.Any, None
+]:
     """
     Query FMP Historical Chart API.
 
-    This API endpoint is a multifunction tool!
+    This API endpoint is a multifunction tool!  A from_date..to_date range longer than one request returns (see
+    HISTORICAL_CHART_WINDOW_DAYS) is split into windows that are fetched concurrently and stitched together, newest
+    bar first, with bars repeated where windows meet dropped.
 
     :param apikey: Your API key
     :param symbol: The Ticker, Index, Commodity, etc. symbol to query for.
@@ -56,16 +156,66 @@ def historical_chart(
     :param from_date: The starting time for the API ("yyyy-mm-dd")
     :param to_date: The starting time for the API ("yyyy-mm-dd")
     :param time_series: line as default
+    :param format: 'records' for a list of dictionaries, 'objects' for a list of IntradayBar, 'columns' for a NumPy
+        structured array or 'arrow' for an Arrow table, with dates as datetime64.  Ignored if stream is True.
+    :param stream: If True, return an iterator that yields bars as their windows arrive, so only max_workers windows
+        are held in memory at once.
+    :param max_workers: Number of windows fetched at once.
 
     :return: A list of dictionaries.
     """
-    path = f"historical-chart/{__validate_time_delta(time_delta)}/{symbol}"
-    query_vars = {"apikey": apikey}
+    __validate_format(format, objects=True)
+    time_delta = __validate_time_delta(time_delta)
+    windows = [(from_date, to_date)]
+    if from_date and to_date and time_delta in HISTORICAL_CHART_WINDOW_DAYS:
+        windows = __date_windows(
+            from_date, to_date, HISTORICAL_CHART_WINDOW_DAYS[time_delta]
+        )
+    calls = [
+        {
+            "apikey": apikey,
+            "symbol": symbol,
+            "time_delta": time_delta,
+            "from_date": start,
+            "to_date": end,
+            "time_series": time_series,
+        }
+        for start, end in reversed(windows)
+    ]
+    if len(calls) == 1:
+        records = __historical_chart_request(**calls[0])
+        if stream:
+            return __stitch_bars([records])
+        return __format_result(records, format, IntradayBar, symbol)
+
+    windows = __iter_concurrently(__historical_chart_request, calls, max_workers)
+    if stream:
+        return __stitch_bars(windows)
+    failures = []
+    bars = list(__stitch_bars(windows, failures))
+    if len(failures) == len(calls):
+        # No window succeeded: fail the way a one-window range does.
+        return failures[0]
+    for failure in failures:
+        if failure is not None:
+            logging.error(f"Unexpected historical_chart response: {str(failure)[:200]}")
+    return __format_result(bars, format, IntradayBar, symbol)
+
+
+def __historical_price_request(
+    apikey: str,
+    symbols: typing.List[str],
+    from_date: typing.Optional[str],
+    to_date: typing.Optional[str],
+) -> typing.Optional[typing.Dict]:
+    """
+    Query FMP Historical Price Full API for one URL-sized list of symbols.
+    """
+    path = f"historical-price-full/{','.join(symbols)}"
     query_vars = {
         "apikey": apikey,
     }
-    if time_series:
-        query_vars["timeseries"] = time_series
+
     if from_date:
         query_vars["from"] = from_date
     if to_date:
@@ -73,35 +223,77 @@ def historical_chart(
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
+def __historical_stock_list(res: typing.Any) -> typing.Any:
+    """
+    The per-symbol entries of a Historical Price Full response, whether it was for one symbol or several.
+
+    Anything else (None, [] for a symbol without data, or an error body) is returned as is.
+    """
+    if isinstance(res, dict):
+        if "historicalStockList" in res:
+            return res["historicalStockList"]
+        if "historical" in res:
+            return [res]
+    return res
+
+
 def historical_price_full(
     apikey: str,
     symbol: typing.Union[str, typing.List],
     from_date: str = None,
     to_date: str = None,
-) -> typing.Optional[typing.List[typing.Dict]]:
+    format: str = "records",
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> typing.Union[typing.List[typing.Dict], typing.Any, None]:
     """
     Query FMP Historical Price Full API.
 
-    This API endpoint is a multifunction tool!
+    This API endpoint is a multifunction tool!  More than HISTORICAL_SYMBOLS_PER_REQUEST symbols are split into
+    requests that run concurrently; their histories are merged in input order and symbols with no history are logged.
 
     :param apikey: Your API Key
     :param symbol: The Ticker, Index, Commodity, etc. symbol to query for.
     :param from_date: 'YYYY-MM-DD' format
     :param to_date: 'YYYY-MM-DD' format
+    :param format: 'records' for a list of dictionaries, 'objects' for a list of Bar, 'columns' for a NumPy structured
+        array or 'arrow' for an Arrow table, with dates as datetime64.  Bars of several symbols are returned as one
+        list or table with a symbol column.
+    :param max_workers: Number of requests in flight at once when the symbols are split.
     :return: A list of dictionaries.
     """
-    if type(symbol) is list:
-        symbol = ",".join(symbol)
-    path = f"historical-price-full/{symbol}"
-    query_vars = {
-        "apikey": apikey,
-    }
-
-    if from_date:
-        query_vars["from"] = from_date
-    if to_date:
-        query_vars["to"] = to_date
-
-    res = __return_json_v3(path=path, query_vars=query_vars)
+    __validate_format(format, objects=True)
+    chunks = __symbol_chunks(symbol, HISTORICAL_SYMBOLS_PER_REQUEST)
+    results = __map_concurrently(
+        __historical_price_request,
+        [
+            {
+                "apikey": apikey,
+                "symbols": chunk,
+                "from_date": from_date,
+                "to_date": to_date,
+            }
+            for chunk in chunks
+        ],
+        max_workers,
+    )
+    if len(chunks) == 1:
+        res = results[0]
+    else:
+        stocks = __merge_by_symbol(
+            sum(chunks, []),
+            [__historical_stock_list(res) for res in results],
+            "historical_price_full",
+        )
+        res = {"historicalStockList": stocks} if isinstance(stocks, list) else stocks
+    if not isinstance(res, dict):
+        # None if the request failed, [] if the symbol has no data.
+        return __format_result(res, format, Bar)
 
-    return res.get("historicalStockList", res.get("historical", None))
+    records = res.get("historicalStockList", res.get("historical", None))
+    if format != "records" and "historicalStockList" in res:
+        records = (
+            {"symbol": stock["symbol"], **bar}
+            for stock in records
+            for bar in stock.get("historical", [])
+        )
+    return __format_result(records, format, Bar, res.get("symbol"))
@@ -1,10 +1,14 @@
 import logging
 import typing
 
-import requests
-
-from .settings import DEFAULT_LIMIT, SEC_RSS_FEEDS_FILENAME, BASE_URL_v3
-from .url_methods import __return_json_v3, __return_json_v4
+from .columns import __columns_from_stream, __validate_format
+from .settings import DEFAULT_LIMIT, SEC_RSS_FEEDS_FILENAME
+from .url_methods import (
+    __download_v3,
+    __iter_json_v3,
+    __return_json_v3,
+    __return_json_v4,
+)
 
 
 def institutional_holders(
@@ -99,24 +103,36 @@ def sec_rss_feeds(
     query_vars = {"apikey": apikey}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving SEC RSS Feeds as {filename}.")
     else:
         query_vars["limit"] = limit
         return __return_json_v3(path=path, query_vars=query_vars)
 
 
-def cik_list(apikey: str) -> typing.Optional[typing.List[typing.Dict]]:
+def cik_list(
+    apikey: str, stream: bool = False, format: str = "records"
+) -> typing.Union[
+    typing.List[typing.Dict], typing.Iterator[typing.Dict], typing.Any, None
+]:
     """
     Query FMP /cik_list/ API.
 
     Complete list of all institutional investment managers by cik
     :param apikey: Your API key.
+    :param stream: If True, return an iterator that yields records one at a time as they are downloaded.
+    :param format: 'records' for a list of dictionaries, 'columns' for a NumPy structured array or 'arrow' for an
+        Arrow table.  Columns are filled as the response is downloaded.  Ignored if stream is True.
     :return: A list of dictionaries.
     """
     path = f"cik_list"
     query_vars = {"apikey": apikey}
+    if stream:
+        return __iter_json_v3(path=path, query_vars=query_vars)
+    if __validate_format(format) != "records":
+        return __columns_from_stream(
+            __iter_json_v3(path=path, query_vars=query_vars), format
+        )
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
@@ -149,8 +165,8 @@ def cik(apikey: str, cik_id: str) -> typing.Optional[typing.List[typing.Dict]]:
 
 
 def form_13f(
-    apikey: str, cik_id: str, date: str = None
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str, cik_id: str, date: str = None, stream: bool = False
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /form-thirteen/ API.
 
@@ -159,12 +175,15 @@ def form_13f(
     :param apikey: Your API key.
     :param cik_id: CIK value
     :param date: 'YYYY-MM-DD'
+    :param stream: If True, return an iterator that yields records one at a time as they are downloaded.
     :return: A list of dictionaries.
     """
     path = f"form-thirteen/{cik_id}"
     query_vars = {"apikey": apikey}
     if date:
         query_vars["date"] = date
+    if stream:
+        return __iter_json_v3(path=path, query_vars=query_vars)
     return __return_json_v3(path=path, query_vars=query_vars)
 
 
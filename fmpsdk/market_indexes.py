@@ -1,16 +1,13 @@
 import logging
 import typing
 
-import requests
-
 from .general import __quotes
 from .settings import (
     DOWJONES_CONSTITUENTS_FILENAME,
     NASDAQ_CONSTITUENTS_FILENAME,
     SP500_CONSTITUENTS_FILENAME,
-    BASE_URL_v3,
 )
-from .url_methods import __return_json_v3
+from .url_methods import __download_v3, __return_json_v3
 
 
 def indexes(apikey: str) -> typing.Optional[typing.List[typing.Dict]]:
@@ -41,8 +38,7 @@ def sp500_constituent(
     query_vars = {"apikey": apikey}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving SP500 Constituents as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -79,8 +75,7 @@ def nasdaq_constituent(
     query_vars = {"apikey": apikey}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving NASDAQ Constituents as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -117,8 +112,7 @@ def dowjones_constituent(
     query_vars = {"apikey": apikey}
     if download:
         query_vars["datatype"] = "csv"  # Only CSV is supported.
-        response = requests.get(f"{BASE_URL_v3}{path}", params=query_vars)
-        open(filename, "wb").write(response.content)
+        __download_v3(path=path, query_vars=query_vars, filename=filename)
         logging.info(f"Saving DOWJONES Constituents as {filename}.")
     else:
         return __return_json_v3(path=path, query_vars=query_vars)
@@ -0,0 +1,261 @@
+import collections
+import contextvars
+import dataclasses
+import logging
+import threading
+import time
+import typing
+
+from .compression import __endpoint_name
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS: typing.Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+@dataclasses.dataclass
+class RequestEvent:
+    """
+    What happened during one call to the FMP API, passed to every request hook once the call is over.
+
+    Timings are in seconds.  dns, connect and tls are None when an already open connection was reused (or the
+    transport cannot tell them apart: fmpsdk.aio counts the TLS handshake as part of connect).  first_byte runs from
+    sending the last attempt until its response headers arrived, including any connection set-up.  total covers the
+    whole call, retries and backoff included.
+    :param endpoint: Endpoint name, the path without symbols (e.g. "historical-price-full").
+    :param path: Path after the versioned base URL.
+    :param status: HTTP status of the last response, or None if none was received or the cache answered.
+    :param cache: "hit", "miss" or "revalidated", or None if the response is not cacheable.
+    :param retries: Number of retries made after the first attempt.
+    :param error: Why the call failed, or None.
+    """
+
+    endpoint: str
+    path: str
+    status: typing.Optional[int] = None
+    compressed_bytes: int = 0
+    decompressed_bytes: int = 0
+    dns: typing.Optional[float] = None
+    connect: typing.Optional[float] = None
+    tls: typing.Optional[float] = None
+    first_byte: typing.Optional[float] = None
+    total: float = 0.0
+    cache: typing.Optional[str] = None
+    retries: int = 0
+    error: typing.Optional[str] = None
+
+
+__hooks: typing.List[typing.Callable[[RequestEvent], typing.Any]] = []
+__hooks_lock = threading.Lock()
+# The event of the request being sent on this thread or task, so connection set-up can record its timings.
+__current_event: contextvars.ContextVar[typing.Optional[RequestEvent]] = (
+    contextvars.ContextVar("fmpsdk_current_event", default=None)
+)
+
+
+def add_request_hook(
+    hook: typing.Callable[[RequestEvent], typing.Any],
+) -> typing.Callable[[RequestEvent], typing.Any]:
+    """
+    Call hook with a RequestEvent after every request, including requests answered from the cache.
+
+    Hooks run on the thread (or event loop) that made the request, so they should be quick.  Exceptions they raise are
+    logged and otherwise ignored.
+    :param hook: Callable taking a RequestEvent, e.g. a MetricsCollector.
+    :return: hook, so this can be used as a decorator.
+    """
+    with __hooks_lock:
+        __hooks.append(hook)
+    return hook
+
+
+def remove_request_hook(hook: typing.Callable[[RequestEvent], typing.Any]) -> None:
+    """
+    Stop calling a hook registered with add_request_hook().
+    """
+    with __hooks_lock:
+        if hook in __hooks:
+            __hooks.remove(hook)
+
+
+class MetricsCollector:
+    """
+    Request hook that aggregates RequestEvents per endpoint and renders them in the Prometheus text format.
+
+    Register it with fmpsdk.add_request_hook(collector) and serve collector.render() from your exporter.
+    :param buckets: Upper bounds of the latency histogram buckets, in seconds.
+    :param namespace: Prefix of every metric name.
+    """
+
+    def __init__(
+        self,
+        buckets: typing.Sequence[float] = DEFAULT_BUCKETS,
+        namespace: str = "fmpsdk",
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self.__lock = threading.Lock()
+        self.__requests: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self.__cache: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self.__retries: typing.Counter[str] = collections.Counter()
+        self.__bytes: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        # (endpoint, phase) -> [count per bucket..., count, sum]
+        self.__latencies: typing.Dict[typing.Tuple[str, str], typing.List[float]] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        if event.status is not None:
+            status = str(event.status)
+        elif event.cache == "hit":
+            status = "cached"
+        else:
+            status = "error"
+        with self.__lock:
+            self.__requests[event.endpoint, status] += 1
+            if event.cache is not None:
+                self.__cache[event.endpoint, event.cache] += 1
+            self.__retries[event.endpoint] += event.retries
+            self.__bytes[event.endpoint, "compressed"] += event.compressed_bytes
+            self.__bytes[event.endpoint, "decompressed"] += event.decompressed_bytes
+            for phase in ("dns", "connect", "tls", "first_byte", "total"):
+                seconds = getattr(event, phase)
+                if seconds is not None:
+                    self.__observe(event.endpoint, phase, seconds)
+
+    def __observe(self, endpoint: str, phase: str, seconds: float) -> None:
+        histogram = self.__latencies.get((endpoint, phase))
+        if histogram is None:
+            histogram = self.__latencies[endpoint, phase] = [0.0] * (
+                len(self.buckets) + 2
+            )
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += 1
+        histogram[-1] += seconds
+
+    def reset(self) -> None:
+        """
+        Zero every counter and histogram.
+        """
+        with self.__lock:
+            self.__requests.clear()
+            self.__cache.clear()
+            self.__retries.clear()
+            self.__bytes.clear()
+            self.__latencies.clear()
+
+    @staticmethod
+    def __escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def __format_value(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+        ns = self.namespace
+        lines = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+
+        def sample(name: str, labels: typing.Dict[str, str], value: float) -> None:
+            label_text = ",".join(
+                f'{k}="{self.__escape_label(v)}"' for k, v in labels.items()
+            )
+            lines.append(f"{ns}_{name}{{{label_text}}} {self.__format_value(value)}")
+
+        with self.__lock:
+            header("requests_total", "counter", "Requests by endpoint and outcome.")
+            for (endpoint, status), count in sorted(self.__requests.items()):
+                sample(
+                    "requests_total", {"endpoint": endpoint, "status": status}, count
+                )
+
+            header("cache_requests_total", "counter", "Cache lookups by result.")
+            for (endpoint, result), count in sorted(self.__cache.items()):
+                sample(
+                    "cache_requests_total",
+                    {"endpoint": endpoint, "result": result},
+                    count,
+                )
+
+            header("retries_total", "counter", "Retries after failed attempts.")
+            for endpoint, count in sorted(self.__retries.items()):
+                sample("retries_total", {"endpoint": endpoint}, count)
+
+            header(
+                "response_bytes_total",
+                "counter",
+                "Response body bytes, as sent on the wire and after decompression.",
+            )
+            for (endpoint, encoding), count in sorted(self.__bytes.items()):
+                sample(
+                    "response_bytes_total",
+                    {"endpoint": endpoint, "encoding": encoding},
+                    count,
+                )
+
+            header(
+                "request_duration_seconds",
+                "histogram",
+                "Request latency by phase: dns, connect, tls, first_byte and total.",
+            )
+            for (endpoint, phase), histogram in sorted(self.__latencies.items()):
+                labels = {"endpoint": endpoint, "phase": phase}
+                for bound, count in zip(self.buckets, histogram):
+                    sample(
+                        "request_duration_seconds_bucket",
+                        {**labels, "le": self.__format_value(bound)},
+                        count,
+                    )
+                sample(
+                    "request_duration_seconds_bucket",
+                    {**labels, "le": "+Inf"},
+                    histogram[-2],
+                )
+                sample("request_duration_seconds_count", labels, histogram[-2])
+                sample("request_duration_seconds_sum", labels, histogram[-1])
+        return "\n".join(lines) + "\n"
+
+
+def __new_event(path: str) -> RequestEvent:
+    """
+    Start the event describing a request to path.
+    """
+    return RequestEvent(endpoint=__endpoint_name(path), path=path)
+
+
+def __emit(
+    event: RequestEvent,
+    started: float,
+    hooks: typing.Optional[typing.List[typing.Callable]] = None,
+) -> None:
+    """
+    Finish an event and pass it to every request hook.
+    :param event: The event to finish.
+    :param started: time.perf_counter() when the request started.
+    :param hooks: Hooks to call instead of the ones added with add_request_hook(), e.g. an FMPClient's.
+    """
+    event.total = time.perf_counter() - started
+    for hook in list(__hooks if hooks is None else hooks):
+        try:
+            hook(event)
+        except Exception:
+            logging.exception(f"Request hook {hook!r} failed.")
@@ -0,0 +1,116 @@
+import threading
+import time
+import typing
+
+from .settings import RATE_LIMIT_PLANS
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that spaces calls out to a steady calls-per-minute rate.
+
+    :param calls_per_minute: Sustained number of calls allowed per minute.
+    :param burst: Number of calls that may be made back-to-back after an idle period.  Defaults to one second's worth.
+    """
+
+    def __init__(self, calls_per_minute: float, burst: typing.Optional[int] = None):
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive.")
+        self.calls_per_minute = calls_per_minute
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(self.rate)))
+        self.__tokens = self.capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none is available.
+
+        :return: Seconds the caller must wait before making its call.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.capacity, self.__tokens + (now - self.__updated) * self.rate
+            )
+            self.__updated = now
+            self.__tokens -= 1
+            return max(0.0, -self.__tokens / self.rate)
+
+    def acquire(self) -> None:
+        """
+        Block until a call may be made.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Buckets are per apikey because FMP counts the quota per key.  The None entry holds the default settings.
+__limits: typing.Dict[
+    typing.Optional[str], typing.Tuple[float, typing.Optional[int]]
+] = {}
+__buckets: typing.Dict[str, TokenBucket] = {}
+__lock = threading.Lock()
+
+
+def set_rate_limit(
+    plan: typing.Optional[str] = None,
+    calls_per_minute: typing.Optional[float] = None,
+    apikey: typing.Optional[str] = None,
+    burst: typing.Optional[int] = None,
+) -> None:
+    """
+    Limit how fast fmpsdk calls the FMP API.
+
+    All calls in the process made with the same apikey share one token bucket.
+    :param plan: FMP plan name, one of RATE_LIMIT_PLANS ('starter', 'premium', 'ultimate').
+    :param calls_per_minute: Custom limit; overrides plan.
+    :param apikey: Apply the limit to this apikey only.  By default it applies to every apikey without its own limit.
+    :param burst: Number of calls that may be made back-to-back after an idle period.
+    """
+    if calls_per_minute is None:
+        if plan not in RATE_LIMIT_PLANS:
+            raise ValueError(
+                f"Invalid plan value: {plan}.  Valid options: {list(RATE_LIMIT_PLANS)}"
+            )
+        calls_per_minute = RATE_LIMIT_PLANS[plan]
+    with __lock:
+        __limits[apikey] = (calls_per_minute, burst)
+        __reset_buckets(apikey)
+
+
+def clear_rate_limit(apikey: typing.Optional[str] = None) -> None:
+    """
+    Remove a limit set with set_rate_limit().
+
+    :param apikey: The apikey whose limit to remove, or None for the default limit.
+    """
+    with __lock:
+        __limits.pop(apikey, None)
+        __reset_buckets(apikey)
+
+
+def __reset_buckets(apikey: typing.Optional[str]) -> None:
+    if apikey is None:
+        __buckets.clear()
+    else:
+        __buckets.pop(apikey, None)
+
+
+def __bucket_for(query_vars: typing.Dict) -> typing.Optional[TokenBucket]:
+    """
+    Return the token bucket for the apikey in query_vars, or None if calls are not limited.
+    """
+    if not __limits:
+        return None
+    apikey = query_vars.get("apikey")
+    bucket = __buckets.get(apikey)
+    if bucket is None:
+        with __lock:
+            bucket = __buckets.get(apikey)
+            limit = __limits.get(apikey) or __limits.get(None)
+            if bucket is None and limit is not None:
+                bucket = __buckets[apikey] = TokenBucket(*limit)
+    return bucket
@@ -0,0 +1,129 @@
+import dataclasses
+import sys
+import typing
+
+
+@dataclasses.dataclass(slots=True)
+class Quote:
+    """
+    One /quote/ result.  Fields are the JSON keys in snake_case; any the response lacks are None.
+    """
+
+    symbol: typing.Optional[str] = None
+    name: typing.Optional[str] = None
+    price: typing.Optional[float] = None
+    changes_percentage: typing.Optional[float] = None
+    change: typing.Optional[float] = None
+    day_low: typing.Optional[float] = None
+    day_high: typing.Optional[float] = None
+    year_high: typing.Optional[float] = None
+    year_low: typing.Optional[float] = None
+    market_cap: typing.Optional[int] = None
+    price_avg50: typing.Optional[float] = None
+    price_avg200: typing.Optional[float] = None
+    exchange: typing.Optional[str] = None
+    volume: typing.Optional[int] = None
+    avg_volume: typing.Optional[int] = None
+    open: typing.Optional[float] = None
+    previous_close: typing.Optional[float] = None
+    eps: typing.Optional[float] = None
+    pe: typing.Optional[float] = None
+    earnings_announcement: typing.Optional[str] = None
+    shares_outstanding: typing.Optional[int] = None
+    timestamp: typing.Optional[int] = None
+
+
+@dataclasses.dataclass(slots=True)
+class QuoteShort:
+    """
+    One /quote-short/ result.
+    """
+
+    symbol: typing.Optional[str] = None
+    price: typing.Optional[float] = None
+    volume: typing.Optional[int] = None
+
+
+@dataclasses.dataclass(slots=True)
+class Bar:
+    """
+    One daily bar from /historical-price-full/.  Fields are the JSON keys in snake_case; any the response lacks are
+    None.
+    """
+
+    date: typing.Optional[str] = None
+    open: typing.Optional[float] = None
+    high: typing.Optional[float] = None
+    low: typing.Optional[float] = None
+    close: typing.Optional[float] = None
+    adj_close: typing.Optional[float] = None
+    volume: typing.Optional[int] = None
+    unadjusted_volume: typing.Optional[int] = None
+    change: typing.Optional[float] = None
+    change_percent: typing.Optional[float] = None
+    vwap: typing.Optional[float] = None
+    label: typing.Optional[str] = None
+    change_over_time: typing.Optional[float] = None
+    symbol: typing.Optional[str] = None
+
+
+@dataclasses.dataclass(slots=True)
+class IntradayBar:
+    """
+    One bar from /historical-chart/.
+    """
+
+    date: typing.Optional[str] = None
+    open: typing.Optional[float] = None
+    high: typing.Optional[float] = None
+    low: typing.Optional[float] = None
+    close: typing.Optional[float] = None
+    volume: typing.Optional[int] = None
+    symbol: typing.Optional[str] = None
+
+
+# Fields whose values repeat across records (and across symbols, for dates), so equal strings can share one object.
+__INTERNED = {"symbol", "date", "exchange", "label"}
+
+
+def __json_key(field_name: str) -> str:
+    """
+    The JSON key a snake_case field is decoded from, e.g. "adj_close" -> "adjClose".
+    """
+    first, *rest = field_name.split("_")
+    return first + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def __to_objects(
+    records: typing.Iterable[typing.Dict],
+    record_class: type,
+    symbol: typing.Optional[str] = None,
+) -> typing.List:
+    """
+    Convert decoded records to instances of a slotted record class.
+
+    Keys the class has no field for are dropped, and symbol, date, exchange and label strings are interned.  The records
+    are left untouched (a decoded response may be shared between callers), so while this runs both the records and the
+    objects are in memory: objects reduce what is kept, not the peak.
+    :param records: Decoded records.
+    :param record_class: Quote, QuoteShort, Bar or IntradayBar.
+    :param symbol: Symbol for records that do not carry their own, e.g. the bars of a single-symbol request.
+    :return: A list of record_class instances.
+    """
+    names = [field.name for field in dataclasses.fields(record_class)]
+    keys = [__json_key(name) for name in names]
+    interned = [i for i, name in enumerate(names) if name in __INTERNED]
+    symbol_index = names.index("symbol")
+    if symbol is not None:
+        symbol = sys.intern(symbol)
+    objects = []
+    for record in records:
+        # Positional arguments in field order: much cheaper than building keyword arguments per record.
+        values = [record.get(key) for key in keys]
+        for i in interned:
+            if type(values[i]) is str:
+                values[i] = sys.intern(values[i])
+        if values[symbol_index] is None:
+            values[symbol_index] = symbol
+        objects.append(record_class(*values))
+    return objects
@@ -4,6 +4,91 @@ BASE_URL_v3: str = "https://financialmodelingprep.com/api/v3/"
 BASE_URL_v4: str = "https://financialmodelingprep.com/api/v4/"
 DEFAULT_LINE_PARAMETER = "line"
 DEFAULT_LIMIT: int = 10
+DEFAULT_POOL_CONNECTIONS: int = 10
+DEFAULT_POOL_MAXSIZE: int = 10
+DEFAULT_POOL_BLOCK: bool = False
+DEFAULT_KEEP_ALIVE: bool = True
+DEFAULT_AIO_LIMIT: int = 100
+DEFAULT_BATCH_WORKERS: int = 8
+# Most symbols joined into one comma-separated path; longer lists are split into concurrent requests.
+QUOTE_SYMBOLS_PER_REQUEST: int = 200
+HISTORICAL_SYMBOLS_PER_REQUEST: int = 5
+# Days of bars requested at once from /historical-chart/, by interval: about 2,000 bars each.  Longer from_date..to_date
+# ranges are split into windows of this size.
+HISTORICAL_CHART_WINDOW_DAYS: typing.Dict[str, int] = {
+    "1min": 5,
+    "5min": 30,
+    "15min": 60,
+    "30min": 120,
+    "1hour": 240,
+    "4hour": 720,
+}
+# Longest from..to range, in days, the calendar endpoints answer at once ("3 months").  Longer ranges are split.
+CALENDAR_WINDOW_DAYS: int = 90
+# Days before a symbol's last stored bar that sync_prices() fetches again, to pick up revised bars.
+SYNC_OVERLAP_DAYS: int = 5
+# Fields of a /historical-price-full/ bar kept by PriceStore, in column order.
+PRICE_STORE_COLUMNS: typing.Tuple[str, ...] = (
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "adjClose",
+    "volume",
+    "unadjustedVolume",
+    "change",
+    "changePercent",
+    "vwap",
+    "label",
+    "changeOverTime",
+)
+# Longest comma-separated symbol list sent in one path, so URLs stay well under server limits.
+MAX_SYMBOL_LIST_LENGTH: int = 1500
+DEFAULT_MAX_RETRIES: int = 3
+DEFAULT_BACKOFF_FACTOR: float = 0.5
+DEFAULT_MAX_BACKOFF: float = 30.0
+RETRY_DEADLINE: float = 120.0
+RETRY_STATUS_CODES: typing.Tuple[int, ...] = (429, 500, 502, 503, 504)
+STREAM_CHUNK_SIZE: int = 65536
+# Downloads are written next to their target under this suffix, then renamed into place once complete.
+PARTIAL_DOWNLOAD_SUFFIX: str = ".part"
+# The ETag or Last-Modified of the response a partial download came from is kept beside it under this suffix.
+PARTIAL_VALIDATOR_SUFFIX: str = ".validator"
+DEFAULT_CACHE_MAXSIZE: int = 1024
+DEFAULT_CACHE_TTL: float = 300
+# Seconds a cached response stays fresh, by endpoint path prefix.  The longest matching prefix wins.
+CACHE_TTLS: typing.Dict[str, float] = {
+    # Symbol lists and other reference data.
+    "stock/list": 86400,
+    "etf/list": 86400,
+    "available-traded/list": 86400,
+    "financial-statement-symbol-lists": 86400,
+    "cik_list": 86400,
+    "symbol": 86400,
+    "delisted-companies": 86400,
+    "commitment_of_traders_report/list": 86400,
+    # Company reference data.
+    "profile": 21600,
+    "key-executives": 21600,
+    "stock_peers": 21600,
+    "rating": 3600,
+    # Real-time data.
+    "quote": 5,
+    "quote-short": 5,
+    "quotes": 5,
+    "gainers": 30,
+    "losers": 30,
+    "actives": 30,
+    "sectors-performance": 30,
+    "market-hours": 60,
+}
+# Calls per minute allowed by each FMP plan.
+RATE_LIMIT_PLANS: typing.Dict[str, int] = {
+    "starter": 300,
+    "premium": 750,
+    "ultimate": 3000,
+}
 INDUSTRY_VALUES: typing.List = [
     "Entertainment",
     "Oil & Gas Midstream",
@@ -324,3 +409,15 @@ SEC_RSS_FEEDS_FILENAME: str = "sec_rss_feeds.csv"
 SP500_CONSTITUENTS_FILENAME: str = "sp500_constituents.csv"
 NASDAQ_CONSTITUENTS_FILENAME: str = "nasdaq_constituents.csv"
 DOWJONES_CONSTITUENTS_FILENAME: str = "dowjones_constituents.csv"
+# Statements fetched by export_statements(), by function name.  Each is saved under a directory of the same name.
+EXPORT_STATEMENTS: typing.Tuple[str, ...] = (
+    "income_statement",
+    "balance_sheet_statement",
+    "cash_flow_statement",
+    "income_statement_as_reported",
+    "balance_sheet_statement_as_reported",
+    "cash_flow_statement_as_reported",
+)
+# Shapes an endpoint's result can be returned in: a list of dictionaries, a NumPy structured array, an Arrow table or,
+# for quotes and bars, a list of slotted record objects (see records.py).
+RESULT_FORMATS: typing.List[str] = ["records", "columns", "arrow", "objects"]
@@ -3,12 +3,12 @@
 """
 import typing
 
-from .url_methods import __return_json_v4
+from .url_methods import __iter_json_v4, __return_json_v4
 
 
 def shares_float(
-    apikey: str, symbol: str, all: bool = False
-) -> typing.Optional[typing.List[typing.Dict]]:
+    apikey: str, symbol: str, all: bool = False, stream: bool = False
+) -> typing.Union[typing.List[typing.Dict], typing.Iterator[typing.Dict], None]:
     """
     Query FMP /shares_float/ API.
 
@@ -16,6 +16,7 @@ def shares_float(
     :param apikey: Your API key.
     :param symbol: Ticker of Company.
     :param all: Optional boolean attribute. If True, changes the API url to the "all" endpoint.
+    :param stream: If True, return an iterator that yields records one at a time as they are downloaded.
     :return: A list of dictionaries.
     """
     if all:
@@ -23,4 +24,6 @@ def shares_float(
     else:
         path = f"shares_float?symbol={symbol}"
     query_vars = {"apikey": apikey}
+    if stream:
+        return __iter_json_v4(path=path, query_vars=query_vars)
     return __return_json_v4(path=path, query_vars=query_vars)
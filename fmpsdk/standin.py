@@ -0,0 +1,706 @@
+"""
+A local stand-in for the FMP API, and a transport that records real responses and replays them from disk.
+
+Both let the request layer be exercised, tested and benchmarked without a network or an API key:
+
+    with StandInServer(latency=0.02, records=1000) as server:
+        fmpsdk.historical_price_full(apikey="demo", symbol="AAPL")
+
+    with record_replay("fixtures/", mode="record"):
+        fmpsdk.quote(apikey=apikey, symbol="AAPL")  # real response, saved to fixtures/
+    with StandInServer(fixtures="fixtures/"):
+        fmpsdk.quote(apikey="demo", symbol="AAPL")  # served from fixtures/, everything else synthesized
+
+Run `python -m fmpsdk.standin --port 8000` to serve it from another process.
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import os
+import random
+import threading
+import time
+import typing
+import urllib.parse
+import zipfile
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from . import url_methods
+from .compression import __endpoint_name as _endpoint_name
+from .url_methods import (
+    __get_session,
+    __override_adapter,
+    __session_options,
+    configure_session,
+)
+
+# Endpoints whose synthetic payload is a list of symbols rather than data about the symbols in the path.
+_SYMBOL_LISTS = (
+    "stock/list",
+    "etf/list",
+    "available-traded/list",
+    "financial-statement-symbol-lists",
+    "symbol",
+    "cik_list",
+    "delisted-companies",
+    "stock-screener",
+    "shares_float/all",
+)
+_SYMBOLS = ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "NVDA", "TSLA", "BRK-B", "JPM"]
+
+
+def _response_key(path: str, query: typing.Dict[str, str]) -> str:
+    """
+    Name the file a response to path ("v3/quote/AAPL") and query is recorded under.  The apikey is not part of it.
+    """
+    query = sorted((k, v) for k, v in query.items() if k != "apikey")
+    text = path.strip("/") + "?" + urllib.parse.urlencode(query)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _split_url(url: str) -> typing.Tuple[str, typing.Dict[str, str]]:
+    """
+    Split a URL into its path after "/api/" (e.g. "v3/quote/AAPL") and its query values.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path.split("/api/", 1)[-1]
+    return path, dict(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+
+
+def _load_recording(
+    directory: str, path: str, query: typing.Dict[str, str]
+) -> typing.Optional[typing.Tuple[int, typing.Dict[str, str], bytes]]:
+    """
+    Read the response recorded for this request, if any.
+    :return: Status, headers and body, or None.
+    """
+    key = os.path.join(directory, _response_key(path, query))
+    try:
+        with open(f"{key}.json") as f:
+            meta = json.load(f)
+        with open(f"{key}.body", "rb") as f:
+            body = f.read()
+    except FileNotFoundError:
+        return None
+    return meta["status"], meta["headers"], body
+
+
+def _save_recording(
+    directory: str,
+    path: str,
+    query: typing.Dict[str, str],
+    status: int,
+    headers: typing.Mapping[str, str],
+    body: bytes,
+) -> None:
+    """
+    Record a response on disk, with its body already decompressed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    key = os.path.join(directory, _response_key(path, query))
+    kept = {
+        k: v
+        for k, v in headers.items()
+        if k.lower() in ("content-type", "etag", "last-modified", "retry-after")
+    }
+    with open(f"{key}.body", "wb") as f:
+        f.write(body)
+    with open(f"{key}.json", "w") as f:
+        json.dump(
+            {
+                "path": path,
+                "query": {k: v for k, v in query.items() if k != "apikey"},
+                "status": status,
+                "headers": kept,
+            },
+            f,
+            indent=1,
+        )
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter that saves real FMP responses to a directory and serves them back from it.
+
+    :param directory: Where responses are recorded, one .json/.body file pair per distinct request (ignoring apikey).
+    :param mode: "record" always goes to the network and saves the response, "replay" only serves recorded
+        responses and fails on anything else, "auto" replays what it has and records the rest.
+    """
+
+    MODES = ("record", "replay", "auto")
+
+    def __init__(self, directory: str, mode: str = "replay", **kwargs):
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Invalid mode value: {mode}.  Valid options: {list(self.MODES)}"
+            )
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.mode = mode
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        path, query = _split_url(request.url)
+        if self.mode != "record":
+            recording = _load_recording(self.directory, path, query)
+            if recording is not None:
+                status, headers, body = recording
+                raw = urllib3.HTTPResponse(
+                    body=io.BytesIO(body),
+                    headers={**headers, "Content-Length": str(len(body))},
+                    status=status,
+                    preload_content=False,
+                    decode_content=False,
+                )
+                response = self.build_response(request, raw)
+                if not kwargs.get("stream"):
+                    response.content
+                return response
+            if self.mode == "replay":
+                # Not a ConnectionError, so the request layer does not retry it.
+                raise requests.RequestException(
+                    f"No recorded response for {path} in {self.directory}.",
+                    request=request,
+                )
+        response = super().send(request, **kwargs)
+        _save_recording(
+            self.directory,
+            path,
+            query,
+            response.status_code,
+            response.headers,
+            response.content,
+        )
+        return response
+
+
+@contextlib.contextmanager
+def record_replay(
+    directory: str, mode: str = "auto"
+) -> typing.Iterator[RecordReplayAdapter]:
+    """
+    Route the shared session through a RecordReplayAdapter for the duration of a with block.
+
+    Sessions built during the block (by configure_session() or a new FMPClient) use the adapter too, so nothing
+    reaches the network behind its back.
+    :param directory: Where responses are recorded.
+    :param mode: "record", "replay" or "auto"; see RecordReplayAdapter.
+    :return: The adapter.
+    """
+    session = __get_session()
+    adapter = RecordReplayAdapter(directory, mode)
+    previous = {prefix: session.adapters[prefix] for prefix in ("https://", "http://")}
+    for prefix in previous:
+        session.mount(prefix, adapter)
+    __override_adapter(adapter)
+    try:
+        yield adapter
+    finally:
+        __override_adapter(None)
+        for prefix, old_adapter in previous.items():
+            session.mount(prefix, old_adapter)
+        current = __get_session()
+        if current is not session and adapter in current.adapters.values():
+            # The shared session was rebuilt during the block; rebuild it once more without the adapter.
+            configure_session(**__session_options)
+        adapter.close()
+
+
+def _symbols_in(
+    endpoint: str, path: str, query: typing.Dict[str, str]
+) -> typing.List[str]:
+    """
+    The symbols a request asks about, from its path (e.g. "quote/AAPL,MSFT") or its query.
+    """
+    segments = path.split("/")[1:]
+    extra = [s for s in segments if s not in endpoint.split("/")]
+    if extra:
+        return [symbol for symbol in extra[0].split(",") if symbol]
+    if "symbol" in query:
+        return query["symbol"].split(",")
+    return _SYMBOLS[:1]
+
+
+def _dates(
+    count: int, query: typing.Dict[str, str], step: datetime.timedelta
+) -> typing.List[datetime.datetime]:
+    """
+    Up to count timestamps, newest first, stepping back from the "to" date (or a fixed day) but not past "from".
+    """
+    end = datetime.datetime(2024, 1, 31, 16)
+    if query.get("to"):
+        end = datetime.datetime.fromisoformat(query["to"])
+        if len(query["to"]) == 10:
+            end = end.replace(hour=16)
+    start = (
+        datetime.datetime.fromisoformat(query["from"])
+        if query.get("from")
+        else datetime.datetime.min
+    )
+    dates = []
+    while len(dates) < count and end >= start:
+        dates.append(end)
+        end -= step
+    return dates
+
+
+def _bar(rng: random.Random, date: str, price: float) -> typing.Dict:
+    open_ = round(price * (1 + rng.uniform(-0.01, 0.01)), 2)
+    close = round(price, 2)
+    return {
+        "date": date,
+        "open": open_,
+        "high": round(max(open_, close) * 1.005, 2),
+        "low": round(min(open_, close) * 0.995, 2),
+        "close": close,
+        "volume": rng.randint(10**5, 10**8),
+    }
+
+
+def _daily_bars(
+    rng: random.Random, count: int, query: typing.Dict[str, str]
+) -> typing.List[typing.Dict]:
+    price = rng.uniform(10, 500)
+    bars = []
+    for date in _dates(count, query, datetime.timedelta(days=1)):
+        price *= 1 + rng.uniform(-0.02, 0.02)
+        bar = _bar(rng, date.date().isoformat(), price)
+        change = round(bar["close"] - bar["open"], 2)
+        bar.update(
+            adjClose=bar["close"],
+            unadjustedVolume=bar["volume"],
+            change=change,
+            changePercent=round(change / bar["open"] * 100, 5),
+            vwap=round((bar["high"] + bar["low"] + bar["close"]) / 3, 4),
+            label=date.strftime("%B %d, %y"),
+            changeOverTime=round(change / bar["open"], 7),
+        )
+        bars.append(bar)
+    return bars
+
+
+def _synthetic_payload(
+    rng: random.Random,
+    endpoint: str,
+    path: str,
+    query: typing.Dict[str, str],
+    records: int,
+) -> typing.Any:
+    """
+    Invent a plausible response body, shaped like the real one for the endpoints fmpsdk uses most.
+    """
+    symbols = _symbols_in(endpoint, path, query)
+    if endpoint in ("quote", "quote-short") or endpoint.startswith("quotes"):
+        quotes = []
+        for symbol in symbols:
+            price = round(rng.uniform(10, 500), 2)
+            quote = {
+                "symbol": symbol,
+                "price": price,
+                "volume": rng.randint(10**5, 10**8),
+            }
+            if endpoint != "quote-short":
+                quote.update(
+                    name=f"{symbol} Inc.",
+                    changesPercentage=round(rng.uniform(-5, 5), 4),
+                    change=round(rng.uniform(-5, 5), 2),
+                    dayLow=round(price * 0.98, 2),
+                    dayHigh=round(price * 1.02, 2),
+                    yearHigh=round(price * 1.4, 2),
+                    yearLow=round(price * 0.7, 2),
+                    marketCap=rng.randint(10**9, 3 * 10**12),
+                    priceAvg50=round(price * 0.97, 4),
+                    priceAvg200=round(price * 0.9, 4),
+                    exchange="NASDAQ",
+                    avgVolume=rng.randint(10**5, 10**8),
+                    open=round(price * 0.99, 2),
+                    previousClose=round(price * 1.01, 2),
+                    eps=round(rng.uniform(-5, 20), 2),
+                    pe=round(rng.uniform(5, 80), 2),
+                    earningsAnnouncement="2024-04-25T00:00:00.000+0000",
+                    sharesOutstanding=rng.randint(10**7, 10**10),
+                    timestamp=1706745600,
+                )
+            quotes.append(quote)
+        return quotes
+    if endpoint == "profile":
+        return [
+            {
+                "symbol": symbol,
+                "price": round(rng.uniform(10, 500), 2),
+                "beta": round(rng.uniform(0.5, 2), 3),
+                "volAvg": rng.randint(10**5, 10**8),
+                "mktCap": rng.randint(10**9, 3 * 10**12),
+                "lastDiv": round(rng.uniform(0, 5), 2),
+                "range": "100.0-200.0",
+                "changes": round(rng.uniform(-5, 5), 2),
+                "companyName": f"{symbol} Inc.",
+                "currency": "USD",
+                "cik": f"{rng.randint(1, 2000000):010d}",
+                "isin": f"US{rng.randint(0, 10**10):010d}",
+                "exchange": "NASDAQ Global Select",
+                "exchangeShortName": "NASDAQ",
+                "industry": "Consumer Electronics",
+                "website": f"https://www.{symbol.lower()}.com",
+                "description": " ".join(["Lorem ipsum dolor sit amet."] * 40),
+                "ceo": "Jane Doe",
+                "sector": "Technology",
+                "country": "US",
+                "fullTimeEmployees": str(rng.randint(100, 200000)),
+                "ipoDate": "1980-12-12",
+            }
+            for symbol in symbols
+        ]
+    if endpoint == "historical-price-full":
+        histories = [
+            {"symbol": symbol, "historical": _daily_bars(rng, records, query)}
+            for symbol in symbols
+        ]
+        return (
+            histories[0] if len(histories) == 1 else {"historicalStockList": histories}
+        )
+    if endpoint.startswith("historical-chart"):
+        interval = path.split("/")[1]
+        minutes = {
+            "1min": 1,
+            "5min": 5,
+            "15min": 15,
+            "30min": 30,
+            "1hour": 60,
+            "4hour": 240,
+        }
+        step = datetime.timedelta(minutes=minutes.get(interval, 1))
+        price = rng.uniform(10, 500)
+        bars = []
+        for date in _dates(records, query, step):
+            price *= 1 + rng.uniform(-0.002, 0.002)
+            bars.append(_bar(rng, date.strftime("%Y-%m-%d %H:%M:%S"), price))
+        return bars
+    if endpoint in _SYMBOL_LISTS:
+        return [
+            {
+                "symbol": f"SYM{i}",
+                "name": f"Synthetic Company {i}",
+                "price": round(rng.uniform(1, 500), 2),
+                "exchange": "New York Stock Exchange",
+                "exchangeShortName": "NYSE",
+                "type": "stock",
+            }
+            for i in range(records)
+        ]
+    if endpoint.endswith("calendar"):
+        start = datetime.date.fromisoformat(query.get("from", "2024-01-01"))
+        end = datetime.date.fromisoformat(query.get("to", "2024-03-31"))
+        days = max((end - start).days, 0) + 1
+        return [
+            {
+                "date": (
+                    start + datetime.timedelta(days=rng.randrange(days))
+                ).isoformat(),
+                "symbol": rng.choice(_SYMBOLS),
+                "eps": round(rng.uniform(-2, 5), 2),
+                "epsEstimated": round(rng.uniform(-2, 5), 2),
+            }
+            for _ in range(records)
+        ]
+    if "statement" in endpoint or endpoint in (
+        "ratios",
+        "key-metrics",
+        "enterprise-values",
+    ):
+        limit = min(int(query.get("limit", records) or records), records)
+        quarter = query.get("period") == "quarter"
+        rows = []
+        for i in range(limit):
+            year = 2023 - (i // 4 if quarter else i)
+            row = {
+                "date": f"{year}-{(12 - 3 * (i % 4)) if quarter else 12:02d}-31",
+                "symbol": symbols[0],
+                "reportedCurrency": "USD",
+                "period": f"Q{4 - i % 4}" if quarter else "FY",
+                "calendarYear": str(year),
+            }
+            for field in range(40):
+                row[f"item{field}"] = rng.randint(-(10**11), 10**11)
+            rows.append(row)
+        return rows
+    return [
+        {
+            "symbol": symbols[i % len(symbols)],
+            "date": (
+                datetime.date(2024, 1, 31) - datetime.timedelta(days=i)
+            ).isoformat(),
+            "value": round(rng.uniform(-1000, 1000), 4),
+        }
+        for i in range(records)
+    ]
+
+
+def _to_csv(payload: typing.Any) -> bytes:
+    """
+    Render a JSON payload the way FMP renders datatype=csv.
+    """
+    rows = (
+        payload.get("historical", [payload]) if isinstance(payload, dict) else payload
+    )
+    buffer = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _to_zip(rng: random.Random, symbol: str, records: int) -> bytes:
+    """
+    Build an archive like /financial-statements/?datatype=zip: one CSV per statement.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for statement in (
+            "income-statement",
+            "balance-sheet-statement",
+            "cash-flow-statement",
+        ):
+            rows = _synthetic_payload(
+                rng, statement, f"{statement}/{symbol}", {"period": "quarter"}, records
+            )
+            archive.writestr(f"{symbol}-{statement}-quarter.csv", _to_csv(rows))
+    return buffer.getvalue()
+
+
+class StandInServer:
+    """
+    Local HTTP server that answers the v3 and v4 paths fmpsdk uses with recorded or synthetic payloads.
+
+    While it runs inside a with block, fmpsdk's base URLs point at it.  Payloads are generated deterministically
+    from the path and query, so repeated runs see the same data.
+    :param host: Interface to listen on.
+    :param port: Port to listen on; 0 picks a free one.
+    :param latency: Seconds to wait before answering each request.
+    :param jitter: Up to this many extra seconds, chosen at random, added to latency.
+    :param records: Number of rows in synthetic list payloads (bars, symbols, statements...).
+    :param endpoint_records: Row counts for particular endpoints, e.g. {"stock/list": 50000}.
+    :param rate_limit_ratio: Fraction of requests answered with HTTP 429.
+    :param retry_after: Retry-After header sent with those 429s, or None for no header.
+    :param fixtures: Directory of responses saved by record_replay(); they are served in preference to synthetic ones.
+    :param compress: If True, gzip bodies for clients that accept it.
+    :param seed: Seed for the 429 injection and the synthetic payloads.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        records: int = 100,
+        endpoint_records: typing.Optional[typing.Dict[str, int]] = None,
+        rate_limit_ratio: float = 0.0,
+        retry_after: typing.Optional[float] = 1.0,
+        fixtures: typing.Optional[str] = None,
+        compress: bool = True,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.records = records
+        self.endpoint_records = dict(endpoint_records or {})
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.fixtures = fixtures
+        self.compress = compress
+        self.seed = seed
+        self.requests_served = 0
+        self.__rng = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__payloads: typing.Dict[str, typing.Tuple[int, typing.Dict, bytes]] = {}
+        self.__server = _StandInHTTPServer((host, port), _StandInHandler)
+        self.__server.stand_in = self
+        self.__thread: typing.Optional[threading.Thread] = None
+        self.__saved_urls: typing.Optional[typing.Tuple[str, str]] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url_v3(self) -> str:
+        return f"{self.url}/api/v3/"
+
+    @property
+    def base_url_v4(self) -> str:
+        return f"{self.url}/api/v4/"
+
+    def start(self) -> "StandInServer":
+        """
+        Serve requests on a background thread.
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__server.serve_forever, name="fmpsdk-standin", daemon=True
+            )
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the listening socket.
+        """
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        self.__saved_urls = url_methods.BASE_URL_v3, url_methods.BASE_URL_v4
+        url_methods.BASE_URL_v3 = self.base_url_v3
+        url_methods.BASE_URL_v4 = self.base_url_v4
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.__saved_urls is not None:
+            url_methods.BASE_URL_v3, url_methods.BASE_URL_v4 = self.__saved_urls
+            self.__saved_urls = None
+        self.stop()
+
+    def payload(
+        self, path: str, query: typing.Dict[str, str]
+    ) -> typing.Tuple[int, typing.Dict[str, str], bytes]:
+        """
+        The status, headers and body served for a path after "/api/" (e.g. "v3/quote/AAPL") and its query.
+        """
+        key = _response_key(path, query)
+        cached = self.__payloads.get(key)
+        if cached is not None:
+            return cached
+        recording = (
+            _load_recording(self.fixtures, path, query) if self.fixtures else None
+        )
+        if recording is None:
+            recording = self.__synthesize(path, query, key)
+        with self.__lock:
+            self.__payloads[key] = recording
+        return recording
+
+    def __synthesize(
+        self, path: str, query: typing.Dict[str, str], key: str
+    ) -> typing.Tuple[int, typing.Dict[str, str], bytes]:
+        version, _, api_path = path.partition("/")
+        endpoint = _endpoint_name(api_path)
+        records = self.endpoint_records.get(endpoint, self.records)
+        rng = random.Random(f"{self.seed}:{key}")
+        if query.get("datatype") == "zip":
+            symbol = _symbols_in(endpoint, api_path, query)[0]
+            return (
+                200,
+                {"Content-Type": "application/zip"},
+                _to_zip(rng, symbol, records),
+            )
+        payload = _synthetic_payload(rng, endpoint, api_path, query, records)
+        if query.get("datatype") == "csv":
+            return 200, {"Content-Type": "text/csv"}, _to_csv(payload)
+        return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+    def respond(self, url: str) -> typing.Tuple[int, typing.Dict[str, str], bytes]:
+        """
+        Answer one request for url (e.g. "/api/v3/quote/AAPL?apikey=demo"), after the configured latency.
+
+        :return: Status, headers and uncompressed body.
+        """
+        with self.__lock:
+            self.requests_served += 1
+            delay = self.latency + self.jitter * self.__rng.random()
+            limited = self.__rng.random() < self.rate_limit_ratio
+        if delay > 0:
+            time.sleep(delay)
+        if limited:
+            headers = {"Content-Type": "application/json"}
+            if self.retry_after is not None:
+                headers["Retry-After"] = str(self.retry_after)
+            return (
+                429,
+                headers,
+                b'{"Error Message": "Limit Reach. Please upgrade your plan."}',
+            )
+        path, query = _split_url(url)
+        return self.payload(path, query)
+
+
+class _StandInHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    # Fan-out benchmarks open many connections at once; the default backlog of 5 makes the kernel drop SYNs.
+    request_queue_size = 1024
+
+
+class _StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle's algorithm on, the body waits for a delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        stand_in = self.server.stand_in
+        status, headers, body = stand_in.respond(self.path)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if (
+            stand_in.compress
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+            and len(body) > 256
+        ):
+            body = gzip.compress(body, compresslevel=5, mtime=0)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the FMP API."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--fixtures", default=None)
+    parser.add_argument("--no-compress", action="store_true")
+    args = parser.parse_args()
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        records=args.records,
+        rate_limit_ratio=args.rate_limit_ratio,
+        fixtures=args.fixtures,
+        compress=not args.no_compress,
+    ).start()
+    print(f"Serving the FMP stand-in on {server.url}/api/v3/ and {server.url}/api/v4/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
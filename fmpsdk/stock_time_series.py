@@ -1,22 +1,31 @@
 import typing
 
+from .columns import __format_result, __validate_format
 from .general import __quotes
+from .records import QuoteShort
 from .url_methods import __return_json_v3, __return_json_v4
 
 
-def quote_short(apikey: str, symbol: str) -> typing.Optional[typing.List[typing.Dict]]:
+def quote_short(
+    apikey: str, symbol: str, format: str = "records"
+) -> typing.Union[typing.List[typing.Dict], typing.List[QuoteShort], typing.Any, None]:
     """
     Query FMP /quote-short/ API.
 
     :param apikey: Your API key
     :param symbol: Company ticker.
+    :param format: 'records' for a list of dictionaries, 'objects' for a list of QuoteShort, 'columns' for a NumPy
+        structured array or 'arrow' for an Arrow table.
     :return: A list of dictionaries.
     """
+    __validate_format(format, objects=True)
     path = f"quote-short/{symbol}"
     query_vars = {
         "apikey": apikey,
     }
-    return __return_json_v3(path=path, query_vars=query_vars)
+    return __format_result(
+        __return_json_v3(path=path, query_vars=query_vars), format, QuoteShort
+    )
 
 
 def exchange_realtime(
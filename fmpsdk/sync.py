@@ -0,0 +1,249 @@
+import contextlib
+import dataclasses
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+from .fan_out import __call_each
+from .general import historical_price_full
+from .settings import (
+    DEFAULT_BATCH_WORKERS,
+    HISTORICAL_SYMBOLS_PER_REQUEST,
+    PRICE_STORE_COLUMNS,
+    SYNC_OVERLAP_DAYS,
+)
+
+
+class PriceStore:
+    """
+    Daily bars of many symbols in a SQLite database file, with the last date synced for each symbol.
+
+    Written by sync_prices(); bars already stored are replaced when they are fetched again, so revisions win.
+    :param path: Database file; created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.__local = threading.local()
+        self.__connections: typing.List[sqlite3.Connection] = []
+        self.__lock = threading.Lock()
+        with self.__connect() as connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS bars (symbol TEXT NOT NULL, "
+                f"{', '.join(PRICE_STORE_COLUMNS)}, PRIMARY KEY (symbol, date)) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS synced "
+                "(symbol TEXT PRIMARY KEY, last_date TEXT, synced_at REAL NOT NULL)"
+            )
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection; sqlite3 connections cannot be shared between threads.
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+    def symbols(self) -> typing.List[str]:
+        """
+        Symbols synced at least once.
+        """
+        rows = self.__connect().execute("SELECT symbol FROM synced ORDER BY symbol")
+        return [symbol for symbol, in rows]
+
+    def last_date(self, symbol: str) -> typing.Optional[str]:
+        """
+        Date of the newest bar stored for symbol, or None if it has no bars.
+        """
+        row = (
+            self.__connect()
+            .execute("SELECT last_date FROM synced WHERE symbol = ?", (symbol,))
+            .fetchone()
+        )
+        return row[0] if row is not None else None
+
+    def bars(
+        self,
+        symbol: str,
+        from_date: typing.Optional[str] = None,
+        to_date: typing.Optional[str] = None,
+    ) -> typing.List[typing.Dict]:
+        """
+        Bars stored for symbol, newest first like /historical-price-full/.
+        :param symbol: Ticker.
+        :param from_date: 'YYYY-MM-DD'; earlier bars are left out.
+        :param to_date: 'YYYY-MM-DD'; later bars are left out.
+        :return: A list of dictionaries.
+        """
+        rows = self.__connect().execute(
+            f"SELECT {', '.join(PRICE_STORE_COLUMNS)} FROM bars WHERE symbol = ? AND date >= ? AND date <= ? "
+            "ORDER BY date DESC",
+            (symbol, from_date or "", to_date or "9999-12-31"),
+        )
+        return [dict(zip(PRICE_STORE_COLUMNS, row)) for row in rows]
+
+    def write(self, symbol: str, bars: typing.Iterable[typing.Dict]) -> int:
+        """
+        Store bars of symbol, replacing any stored for the same dates, and record it as synced.
+        :param symbol: Ticker.
+        :param bars: Bars as returned by historical_price_full().  Fields not in PRICE_STORE_COLUMNS are dropped.
+        :return: Number of bars newer than the previous last date.
+        """
+        previous = self.last_date(symbol) or ""
+        rows = [
+            tuple(bar.get(column) for column in PRICE_STORE_COLUMNS) for bar in bars
+        ]
+        with self.__connect() as connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO bars VALUES (?, {', '.join('?' * len(PRICE_STORE_COLUMNS))})",
+                [(symbol, *row) for row in rows],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO synced VALUES "
+                "(?, (SELECT MAX(date) FROM bars WHERE symbol = ?), ?)",
+                (symbol, symbol, time.time()),
+            )
+        return sum(1 for row in rows if row[0] > previous)
+
+    def close(self) -> None:
+        """
+        Close the database connections opened by every thread.
+        """
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+
+@dataclasses.dataclass
+class SyncSummary:
+    """
+    Outcome of a sync_prices() call.
+
+    new_bars holds the number of bars newer than the last sync for every symbol synced, missing the symbols the API
+    returned no bars for, and errors the exception for every symbol whose request failed.
+    """
+
+    new_bars: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    missing: typing.List[str] = dataclasses.field(default_factory=list)
+    errors: typing.Dict[str, BaseException] = dataclasses.field(default_factory=dict)
+    fetched_bars: int = 0
+    requests: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Synced {len(self.new_bars)} symbols in {self.seconds:.1f}s with {self.requests} requests: "
+            f"{sum(self.new_bars.values())} new bars of {self.fetched_bars} fetched.  "
+            f"{len(self.missing)} without data, {len(self.errors)} failed."
+        )
+
+
+def __sync_jobs(
+    store: PriceStore,
+    symbols: typing.List[str],
+    start_date: typing.Optional[str],
+    overlap_days: int,
+) -> typing.List[typing.Tuple[typing.Optional[str], typing.List[str]]]:
+    """
+    Group symbols into requests: symbols needing bars from the same date share a request, up to
+    HISTORICAL_SYMBOLS_PER_REQUEST each.
+    :return: (from_date, symbols) pairs.
+    """
+    groups: typing.Dict[typing.Optional[str], typing.List[str]] = {}
+    for symbol in symbols:
+        last_date = store.last_date(symbol)
+        from_date = start_date
+        if last_date is not None:
+            from_date = (
+                datetime.date.fromisoformat(last_date)
+                - datetime.timedelta(days=overlap_days)
+            ).isoformat()
+        groups.setdefault(from_date, []).append(symbol)
+    return [
+        (from_date, group[i : i + HISTORICAL_SYMBOLS_PER_REQUEST])
+        for from_date, group in groups.items()
+        for i in range(0, len(group), HISTORICAL_SYMBOLS_PER_REQUEST)
+    ]
+
+
+def sync_prices(
+    apikey: str,
+    symbols: typing.Iterable[str],
+    store: typing.Union[str, PriceStore],
+    start_date: typing.Optional[str] = None,
+    overlap_days: int = SYNC_OVERLAP_DAYS,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> SyncSummary:
+    """
+    Bring the daily bars of many symbols in a local PriceStore up to date, fetching only what is missing.
+
+    A symbol synced before is fetched from its last stored date minus overlap_days, so a nightly run downloads a few
+    bars per symbol instead of its whole history, and bars revised since the last run are replaced.  Symbols that
+    need the same from_date share requests of up to HISTORICAL_SYMBOLS_PER_REQUEST symbols, run on a thread pool.
+    Failures are collected rather than raised, and a summary is logged when the sync ends.
+    Example: fmpsdk.sync_prices(apikey, symbols, store="prices.db")
+    :param apikey: Your API key.
+    :param symbols: Tickers to sync.  Duplicates are synced once.
+    :param store: PriceStore, or the path of its database file.
+    :param start_date: 'YYYY-MM-DD' to start the history of symbols never synced.  None fetches all the API returns.
+    :param overlap_days: Days before the last stored date fetched again to pick up revisions.
+    :param max_workers: Number of requests in flight at once.  The shared connection pool is grown to match.
+    :return: SyncSummary of the symbols synced, missing and failed.
+    """
+    if isinstance(store, str):
+        with contextlib.closing(PriceStore(store)) as opened:
+            return sync_prices(
+                apikey, symbols, opened, start_date, overlap_days, max_workers
+            )
+    symbols = list(dict.fromkeys(symbols))
+    jobs = __sync_jobs(store, symbols, start_date, overlap_days)
+
+    summary = SyncSummary(requests=len(jobs))
+    started = time.perf_counter()
+    calls = {
+        tuple(group): (
+            historical_price_full,
+            {"apikey": apikey, "symbol": group, "from_date": from_date},
+        )
+        for from_date, group in jobs
+    }
+    # Results are written here, on one thread, as they arrive.
+    for group, result, error in __call_each(calls, max_workers):
+        if error is not None:
+            for symbol in group:
+                summary.errors[symbol] = error
+            continue
+        # None or a body other than bars (e.g. {} for an unknown symbol) means no data.
+        result = result if isinstance(result, list) else []
+        if len(group) == 1:
+            histories = {group[0]: result}
+        else:
+            histories = {
+                stock["symbol"]: stock.get("historical", [])
+                for stock in result
+                if isinstance(stock, dict) and "symbol" in stock
+            }
+        for symbol in group:
+            bars = histories.get(symbol) or histories.get(symbol.upper())
+            if not bars:
+                summary.missing.append(symbol)
+                continue
+            summary.new_bars[symbol] = store.write(symbol, bars)
+            summary.fetched_bars += len(bars)
+    summary.seconds = time.perf_counter() - started
+    logging.info(str(summary))
+    for symbol, error in summary.errors.items():
+        logging.warning(f"Could not sync {symbol}: {error}")
+    return summary
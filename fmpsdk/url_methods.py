@@ -1,14 +1,48 @@
+import codecs
+import concurrent.futures
+import contextlib
+import contextvars
+import dataclasses
+import email.utils
+import hashlib
+import json
 import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
 import typing
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 
+from .cache import ResponseCache, __conditional_headers, __get_cache
+from .compression import ACCEPT_ENCODING, __record_transfer
+from .decoder import __loads_json
+from .exceptions import FMPRateLimitError, FMPRequestError
+from .metrics import RequestEvent, __current_event, __emit, __new_event
+from .rate_limit import TokenBucket, __bucket_for
 from .settings import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_BLOCK,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
     INDUSTRY_VALUES,
+    PARTIAL_DOWNLOAD_SUFFIX,
+    PARTIAL_VALIDATOR_SUFFIX,
     PERIOD_VALUES,
+    RETRY_DEADLINE,
+    RETRY_STATUS_CODES,
     SECTOR_VALUES,
     SERIES_TYPE_VALUES,
     STATISTICS_TYPE_VALUES,
+    STREAM_CHUNK_SIZE,
     TECHNICAL_INDICATORS_TIME_DELTA_VALUES,
     TIME_DELTA_VALUES,
     BASE_URL_v3,
@@ -23,51 +57,669 @@ logging.getLogger("requests").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
-def __return_json_v3(
-    path: str, query_vars: typing.Dict
-) -> typing.Optional[typing.List]:
+def __timed_connection_class(base: type) -> type:
     """
-    Query URL for JSON response for v3 of FMP API.
+    Subclass a urllib3 connection class so that opening a connection records its DNS, connect and TLS times on the
+    event of the request being sent.
+    """
+
+    def _new_conn(self):
+        event = __current_event.get()
+        if event is None:
+            return base._new_conn(self)
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                self._dns_host, self.port, type=socket.SOCK_STREAM
+            )
+        except OSError:
+            # Let urllib3 resolve the name again and raise its usual error.
+            return base._new_conn(self)
+        resolved = time.perf_counter()
+        hosts = list(dict.fromkeys(address[4][0] for address in addresses))
+        dns_host = self._dns_host
+        try:
+            # Try each address in turn, like urllib3 does when it resolves the name itself.
+            for i, host in enumerate(hosts):
+                self._dns_host = host
+                try:
+                    sock = base._new_conn(self)
+                    break
+                except urllib3.exceptions.ConnectTimeoutError:
+                    if i == len(hosts) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+        event.dns = resolved - started
+        event.connect = time.perf_counter() - resolved
+        return sock
+
+    def connect(self):
+        started = time.perf_counter()
+        base.connect(self)
+        event = __current_event.get()
+        if (
+            event is not None
+            and event.connect is not None
+            and isinstance(self, urllib3.connection.HTTPSConnection)
+        ):
+            event.tls = max(
+                0.0, time.perf_counter() - started - event.dns - event.connect
+            )
+
+    return type(
+        f"Timed{base.__name__}", (base,), {"_new_conn": _new_conn, "connect": connect}
+    )
+
+
+__POOL_CLASSES = {
+    "http": type(
+        "TimedHTTPConnectionPool",
+        (urllib3.HTTPConnectionPool,),
+        {"ConnectionCls": __timed_connection_class(urllib3.connection.HTTPConnection)},
+    ),
+    "https": type(
+        "TimedHTTPSConnectionPool",
+        (urllib3.HTTPSConnectionPool,),
+        {"ConnectionCls": __timed_connection_class(urllib3.connection.HTTPSConnection)},
+    ),
+}
+
+
+# Adapter mounted on every session built while it is set, instead of a new pooled one.  See standin.record_replay().
+__adapter_override: typing.Optional[HTTPAdapter] = None
+
+
+def __override_adapter(adapter: typing.Optional[HTTPAdapter]) -> None:
+    """
+    Mount adapter on every session built from now on, or stop doing so if adapter is None.
+    """
+    global __adapter_override
+    __adapter_override = adapter
+
+
+def __new_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = DEFAULT_POOL_BLOCK,
+    keep_alive: bool = DEFAULT_KEEP_ALIVE,
+) -> requests.Session:
+    """
+    Build a pooled HTTP session.  See configure_session() for the parameters.
+    """
+    session = requests.Session()
+    adapter = __adapter_override
+    if adapter is None:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        # Pools whose connections time their own set-up, for RequestEvent.
+        adapter.poolmanager.pool_classes_by_scheme = __POOL_CLASSES
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# The FMPClient whose session, cache, rate limiter, retry policy and hooks serve calls made in this context.  None
+# means the module-level ones set with configure_session(), enable_cache(), set_rate_limit()...
+__active_client: contextvars.ContextVar[typing.Optional[typing.Any]] = (
+    contextvars.ContextVar("fmpsdk_active_client", default=None)
+)
+
+# One pooled session is shared by every endpoint so TCP/TLS connections are reused between calls.
+__session: typing.Optional[requests.Session] = None
+__session_lock = threading.RLock()
+__session_options: typing.Dict = {}
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = DEFAULT_POOL_BLOCK,
+    keep_alive: bool = DEFAULT_KEEP_ALIVE,
+) -> requests.Session:
+    """
+    Build (or rebuild) the pooled HTTP session shared by all fmpsdk calls.
+
+    :param pool_connections: Number of per-host connection pools to keep.
+    :param pool_maxsize: Maximum number of connections kept open per host.
+    :param pool_block: If True, never open more than pool_maxsize connections to a host; callers wait instead.
+    :param keep_alive: If False, send "Connection: close" so connections are not reused.
+    :return: The new shared requests.Session.
+    """
+    global __session
+    session = __new_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+    with __session_lock:
+        old_session, __session = __session, session
+        __session_options.update(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+        )
+    if old_session is not None:
+        old_session.close()
+    return session
+
+
+def close_session() -> None:
+    """
+    Close the shared session and all of its pooled connections.
+
+    A new session is created on the next request.
+    """
+    global __session
+    with __session_lock:
+        old_session, __session = __session, None
+    if old_session is not None:
+        old_session.close()
+
+
+def __get_session() -> requests.Session:
+    """
+    Return the active client's session, or the shared session, creating it with default settings on first use.
+    :return: The requests.Session to use.
+    """
+    client = __active_client.get()
+    if client is not None:
+        return client.session
+    session = __session
+    if session is None:
+        with __session_lock:
+            session = __session or configure_session()
+    return session
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Connection errors, timeouts and responses with a status in status_codes are retried up to max_retries times.
+    Waits grow exponentially with full jitter (a random delay between 0 and backoff_factor * 2 ** attempt, capped at
+    max_backoff) unless the server sends Retry-After.  No retry is started that would end past `deadline` seconds
+    after the first attempt.
+    """
+
+    max_retries: int = DEFAULT_MAX_RETRIES
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+    deadline: float = RETRY_DEADLINE
+    status_codes: typing.Tuple[int, ...] = RETRY_STATUS_CODES
+
+    def delay(self, attempt: int, retry_after: typing.Optional[str] = None) -> float:
+        """
+        Seconds to wait before retry number attempt + 1.
+
+        :param attempt: Number of retries made so far.
+        :param retry_after: Value of the response's Retry-After header, if any.
+        :return: Seconds to wait.
+        """
+        retry_after_seconds = self.parse_retry_after(retry_after)
+        if retry_after_seconds is not None:
+            return retry_after_seconds
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+
+    @staticmethod
+    def parse_retry_after(value: typing.Optional[str]) -> typing.Optional[float]:
+        """
+        Parse a Retry-After header given either as seconds or as an HTTP date.
+
+        :param value: Header value.
+        :return: Seconds to wait, or None if the header is missing or invalid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+__retry_policy = RetryPolicy()
+
+
+def configure_retries(
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    max_backoff: float = DEFAULT_MAX_BACKOFF,
+    deadline: float = RETRY_DEADLINE,
+    status_codes: typing.Iterable[int] = RETRY_STATUS_CODES,
+) -> RetryPolicy:
+    """
+    Set how failed requests are retried.  Applies to JSON calls and file downloads.
+
+    :param max_retries: Maximum number of retries per call.  0 disables retries.
+    :param backoff_factor: Base delay in seconds; the maximum delay doubles with each retry.
+    :param max_backoff: Upper bound in seconds for one backoff delay (Retry-After is honored as sent).
+    :param deadline: Total seconds a call may spend, including retries, before giving up.
+    :param status_codes: HTTP status codes that are retried.
+    :return: The new RetryPolicy.
+    """
+    global __retry_policy
+    __retry_policy = RetryPolicy(
+        max_retries=max_retries,
+        backoff_factor=backoff_factor,
+        max_backoff=max_backoff,
+        deadline=deadline,
+        status_codes=tuple(status_codes),
+    )
+    return __retry_policy
+
+
+def __get_retry_policy() -> RetryPolicy:
+    """
+    Return the active client's retry policy, or the one set with configure_retries().
+    """
+    client = __active_client.get()
+    return client.retry_policy if client is not None else __retry_policy
+
+
+def __get_rate_limiter(query_vars: typing.Dict) -> typing.Optional[TokenBucket]:
+    """
+    Return the active client's token bucket, or the one set with set_rate_limit() for the apikey in query_vars.
+    """
+    client = __active_client.get()
+    return client.rate_limiter if client is not None else __bucket_for(query_vars)
+
+
+def __get_response_cache() -> ResponseCache:
+    """
+    Return the active client's cache, or the one set with enable_cache().
+    """
+    client = __active_client.get()
+    return client.cache if client is not None else __get_cache()
+
+
+def __get_request_hooks() -> typing.Optional[typing.List]:
+    """
+    Return the active client's request hooks, or None for the ones added with add_request_hook().
+    """
+    client = __active_client.get()
+    return client.hooks if client is not None else None
+
+
+# Errors raised while sending a request or reading its body that are worth retrying.
+__RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def __get(
+    url: str,
+    query_vars: typing.Dict,
+    headers: typing.Optional[typing.Dict[str, str]] = None,
+    stream: bool = False,
+    event: typing.Optional[RequestEvent] = None,
+) -> requests.Response:
+    """
+    GET url on the shared session, waiting for the rate limiter and retrying per the retry policy.
+
+    :param url: URL to request.
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :param headers: Extra request headers.
+    :param stream: If True, return as soon as the headers arrive and leave the body to be read by the caller.
+    :param event: Event on which to record the status, timings and retry count of the last attempt.
+    :return: The last response received.  Raises the last error if no response could be received.
+    """
+    policy = __get_retry_policy()
+    bucket = __get_rate_limiter(query_vars)
+    give_up_at = time.monotonic() + policy.deadline
+    attempt = 0
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+        if event is not None:
+            event.retries = attempt
+            event.dns = event.connect = event.tls = None
+        token = __current_event.set(event)
+        try:
+            response = __get_session().get(
+                url,
+                params=query_vars,
+                headers=headers,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                stream=stream,
+            )
+        except __RETRYABLE_ERRORS:
+            if attempt >= policy.max_retries:
+                raise
+            delay = policy.delay(attempt)
+            if time.monotonic() + delay > give_up_at:
+                raise
+            reason = "request error"
+        else:
+            if event is not None:
+                event.status = response.status_code
+                event.first_byte = response.elapsed.total_seconds()
+            if (
+                response.status_code not in policy.status_codes
+                or attempt >= policy.max_retries
+            ):
+                return response
+            delay = policy.delay(attempt, response.headers.get("Retry-After"))
+            if time.monotonic() + delay > give_up_at:
+                return response
+            reason = f"HTTP {response.status_code}"
+            response.close()
+        finally:
+            __current_event.reset(token)
+        attempt += 1
+        logging.warning(
+            f"Retrying {url} after {reason} in {delay:.2f}s (retry {attempt} of {policy.max_retries})."
+        )
+        time.sleep(delay)
+
+
+@dataclasses.dataclass
+class PendingRequest:
+    """
+    An HTTP request an endpoint function needs answered before it can return.
+
+    Used by fmpsdk.aio, which performs these requests on its own event loop instead of the shared session.
+    """
+
+    base_url: str
+    path: str
+    query_vars: typing.Dict
+    filename: typing.Optional[str] = None
+    # If True, the raw response body is wanted rather than decoded JSON.
+    raw: bool = False
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}{self.path}"
+
+    @property
+    def key(self) -> typing.Tuple:
+        query = tuple(sorted((k, str(v)) for k, v in self.query_vars.items()))
+        return self.base_url, self.path, query, self.filename, self.raw
+
+
+class DeferredRequest(Exception):
+    """
+    Raised instead of performing I/O when an endpoint function is driven by fmpsdk.aio.
+
+    The caller performs the listed requests, records their results and calls the endpoint function again.
+    """
+
+    def __init__(self, pending: typing.List[PendingRequest]):
+        super().__init__(f"{len(pending)} request(s) deferred.")
+        self.pending = pending
+
+
+# Results recorded by fmpsdk.aio, keyed by PendingRequest.key.  None means requests are performed normally.
+__deferred_responses: contextvars.ContextVar[typing.Optional[typing.Dict]] = (
+    contextvars.ContextVar("fmpsdk_deferred_responses", default=None)
+)
+
+
+def __replay_or_defer(responses: typing.Dict, request: PendingRequest) -> typing.Any:
+    """
+    Return the recorded result of a deferred request or raise DeferredRequest if it has not been performed yet.
+    :param responses: Results recorded so far, keyed by PendingRequest.key.
+    :param request: The request the endpoint function is about to make.
+    :return: The recorded result.
+    """
+    try:
+        return responses[request.key]
+    except KeyError:
+        raise DeferredRequest([request]) from None
+
+
+# When True, failed requests raise FMPRequestError instead of being logged and returning None.
+__raise_errors: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "fmpsdk_raise_errors", default=False
+)
+
+
+def __request_failed(
+    message: str,
+    url: str,
+    error: typing.Optional[BaseException] = None,
+    status_code: typing.Optional[int] = None,
+    event: typing.Optional[RequestEvent] = None,
+) -> None:
+    """
+    Log a failed request, or raise FMPRequestError if the caller asked for errors to be raised.
+    :param message: Description of the failure.
+    :param url: URL that was requested.
+    :param error: Underlying exception, if any.
+    :param status_code: HTTP status code, if a response was received.
+    :param event: The request's event, on which to record the failure.
+    """
+    if event is not None:
+        event.error = message
+    if __raise_errors.get():
+        error_class = FMPRateLimitError if status_code == 429 else FMPRequestError
+        raise error_class(message, url=url, status_code=status_code) from error
+    logging.error(message)
+
+
+def __record_response(
+    path: str, response: requests.Response, event: RequestEvent
+) -> None:
+    """
+    Count a fully read response's bytes on the wire and after decompression towards its endpoint's transfer stats.
+    """
+    content_length = len(response.content)
+    wire_length = response.raw.tell() if response.raw is not None else content_length
+    __record_transfer(path, wire_length, content_length)
+    event.compressed_bytes = wire_length
+    event.decompressed_bytes = content_length
+
+
+def __decode_json(content: bytes) -> typing.Optional[typing.List]:
+    """
+    Decode a JSON response body, normalizing empty responses to an empty List.
+
+    The raw bytes are handed straight to the configured decoder (see decoder.set_json_decoder()).
+    :param content: Raw response body.
+    :return: JSON response
+    """
+    return_var = None
+    if len(content) > 0:
+        return_var = __loads_json(content)
+
+    if len(content) == 0 or (
+        isinstance(return_var, dict) and len(return_var.keys()) == 0
+    ):
+        logging.warning("Response appears to have no data.  Returning empty List.")
+        return_var = []
+    return return_var
+
+
+def __ensure_pool_maxsize(pool_maxsize: int) -> None:
+    """
+    Grow the active session's per-host pools so that pool_maxsize threads can each keep a connection.
+
+    That is the active FMPClient's session, or else the shared one.  Its adapters are resized in place rather than the
+    session being replaced, so requests in flight and adapters mounted on it (e.g. by standin.record_replay) are kept.
+    :param pool_maxsize: Number of connections needed per host.
+    """
+    with __session_lock:
+        session = __get_session()
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            if (
+                isinstance(adapter, HTTPAdapter)
+                and adapter._pool_maxsize < pool_maxsize
+            ):
+                # Pools are keyed by their options, so hosts get a new, larger pool on their next request.
+                adapter._pool_maxsize = pool_maxsize
+                adapter.poolmanager.connection_pool_kw["maxsize"] = pool_maxsize
+        if session is __session and __session_options:
+            __session_options["pool_maxsize"] = max(
+                __session_options["pool_maxsize"], pool_maxsize
+            )
+
+
+# Requests currently being made, so concurrent identical calls can wait for them instead of repeating them.
+__in_flight: typing.Dict[typing.Tuple, concurrent.futures.Future] = {}
+__in_flight_lock = threading.Lock()
 
+
+def __single_flight(key: typing.Tuple, func: typing.Callable, *args) -> typing.Any:
+    """
+    Call func(*args), unless a call with the same key is already running in another thread; then wait for that call
+    and return its result.
+
+    Callers that share a call receive the very same decoded object, so results should be treated as read-only.
+    :param key: Identity of the call.
+    :param func: Function making the call.
+    :return: func's result.
+    """
+    with __in_flight_lock:
+        future = __in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = __in_flight[key] = concurrent.futures.Future()
+    if not leader:
+        return future.result()
+    try:
+        result = func(*args)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with __in_flight_lock:
+            del __in_flight[key]
+
+
+def __return_json(
+    base_url: str, path: str, query_vars: typing.Dict, raw: bool = False
+) -> typing.Optional[typing.Any]:
+    """
+    Query URL for JSON response.
+
+    :param base_url: Versioned base URL of the FMP API.
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :param raw: If True, return the response body as bytes instead of decoding it.
+    :return: JSON response
+    """
+    request = PendingRequest(base_url, path, query_vars, raw=raw)
+    responses = __deferred_responses.get()
+    if responses is not None:
+        return __replay_or_defer(responses, request)
+
+    # Calls made through different clients use different sessions, caches and limits, so they are never shared.
+    key = request.key + (__raise_errors.get(), __active_client.get())
+    return __single_flight(key, __fetch_json, base_url, path, query_vars, raw)
+
+
+def __fetch_json(
+    base_url: str, path: str, query_vars: typing.Dict, raw: bool = False
+) -> typing.Optional[typing.Any]:
+    """
+    Query URL for JSON response, from the cache when possible.
+
+    :param base_url: Versioned base URL of the FMP API.
     :param path: Path after TLD of URL
     :param query_vars: Dictionary of query values (after "?" of URL)
+    :param raw: If True, return the response body as bytes instead of decoding it.
     :return: JSON response
     """
-    url = f"{BASE_URL_v3}{path}"
+    url = f"{base_url}{path}"
+    decode = bytes if raw else __decode_json
     return_var = None
+    started = time.perf_counter()
+    event = __new_event(path)
+    cache = __get_response_cache()
     try:
-        response = requests.get(
-            url, params=query_vars, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
-        )
-        if len(response.content) > 0:
-            return_var = response.json()
+        cached, fresh = cache.lookup(base_url, path, query_vars)
+        if fresh:
+            event.cache = "hit"
+            return decode(cached.content)
+        if cache.cacheable(path):
+            event.cache = "miss"
 
-        if len(response.content) == 0 or (
-            isinstance(return_var, dict) and len(return_var.keys()) == 0
+        response = __get(url, query_vars, __conditional_headers(cached), event=event)
+        __record_response(path, response, event)
+        if response.status_code == 304 and cached is not None:
+            event.cache = "revalidated"
+            cache.revalidated(base_url, path, query_vars, cached)
+            return decode(cached.content)
+        if (
+            response.status_code == 429
+            or response.status_code >= 500
+            or __raise_errors.get()
         ):
-            logging.warning("Response appears to have no data.  Returning empty List.")
-            return_var = []
+            response.raise_for_status()
+        return_var = decode(response.content)
+        if response.status_code == 200:
+            cache.store(base_url, path, query_vars, response.content, response.headers)
 
-    except requests.Timeout:
-        logging.error(f"Connection to {url} timed out.")
-    except requests.ConnectionError:
-        logging.error(
+    except requests.Timeout as e:
+        __request_failed(f"Connection to {url} timed out.", url, e, event=event)
+    except requests.ConnectionError as e:
+        __request_failed(
             f"Connection to {url} failed:  DNS failure, refused connection or some other connection related "
-            f"issue."
+            f"issue.",
+            url,
+            e,
+            event=event,
         )
-    except requests.TooManyRedirects:
-        logging.error(
-            f"Request to {url} exceeds the maximum number of predefined redirections."
+    except requests.TooManyRedirects as e:
+        __request_failed(
+            f"Request to {url} exceeds the maximum number of predefined redirections.",
+            url,
+            e,
+            event=event,
+        )
+    except requests.HTTPError as e:
+        if e.response.status_code == 429:
+            message = f"Request to {url} was rejected because the API rate limit was exceeded (HTTP 429)."
+        else:
+            message = (
+                f"Request to {url} failed with HTTP status {e.response.status_code}."
+            )
+        __request_failed(
+            message, url, e, status_code=e.response.status_code, event=event
         )
     except Exception as e:
-        logging.error(
+        __request_failed(
             f"A requests exception has occurred that we have not yet detailed an 'except' clause for.  "
-            f"Error: {e}"
+            f"Error: {e}",
+            url,
+            e,
+            event=event,
         )
+    finally:
+        __emit(event, started, __get_request_hooks())
 
     return return_var
 
 
+def __return_json_v3(
+    path: str, query_vars: typing.Dict
+) -> typing.Optional[typing.List]:
+    """
+    Query URL for JSON response for v3 of FMP API.
+
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :return: JSON response
+    """
+    return __return_json(base_url=BASE_URL_v3, path=path, query_vars=query_vars)
+
+
 def __return_json_v4(
     path: str, query_vars: typing.Dict
 ) -> typing.Optional[typing.List]:
@@ -78,38 +730,423 @@ def __return_json_v4(
     :param query_vars: Dictionary of query values (after "?" of URL)
     :return: JSON response
     """
-    url = f"{BASE_URL_v4}{path}"
-    return_var = None
-    try:
-        response = requests.get(
-            url, params=query_vars, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+    return __return_json(base_url=BASE_URL_v4, path=path, query_vars=query_vars)
+
+
+def __return_content_v3(path: str, query_vars: typing.Dict) -> typing.Optional[bytes]:
+    """
+    Query URL for a file from v3 of FMP API, returning its bytes instead of saving it.
+
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :return: Response body, or None if the request failed.
+    """
+    return __return_json(
+        base_url=BASE_URL_v3, path=path, query_vars=query_vars, raw=True
+    )
+
+
+__WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that may follow an array element.
+__DELIMITERS = " \t\n\r,]"
+
+
+def __iter_json_array(
+    chunks: typing.Iterable[bytes],
+) -> typing.Iterator[typing.Any]:
+    """
+    Incrementally parse a JSON document arriving in chunks, yielding the elements of its top-level array one by one.
+
+    Only one element's worth of text is buffered at a time.  A document that is not an array is yielded whole,
+    unless it is an empty object.
+    :param chunks: UTF-8 encoded pieces of the document.
+    :return: Iterator of decoded elements.  Its return value is False if the document was yielded whole.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+    def skip_whitespace() -> bool:
+        """Advance to the next significant character.  Return False at the end of the document."""
+        nonlocal pos
+        while True:
+            pos = __WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return True
+            if eof:
+                return False
+            fill()
+
+    if not skip_whitespace():
+        return True
+    if buffer[pos] != "[":
+        # Not an array (e.g. an error message object): there is nothing to stream, so decode it whole.
+        while not eof:
+            fill()
+        document = json.loads(buffer[pos:])
+        if document != {}:
+            yield document
+            return False
+        return True
+
+    pos += 1
+    expect_comma = False
+    while True:
+        if not skip_whitespace():
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        if buffer[pos] == "]":
+            return True
+        if expect_comma:
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect_comma = False
+            continue
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        if not eof and (end == len(buffer) or buffer[end] not in __DELIMITERS):
+            # A number cut off by the end of the buffer (e.g. "2.5" of "2.5e10") may continue in the next chunk.
+            fill()
+            continue
+        yield element
+        pos = end
+        expect_comma = True
+
+
+def __iter_json(
+    base_url: str, path: str, query_vars: typing.Dict
+) -> typing.Iterator[typing.Any]:
+    """
+    Query URL for a JSON array and return an iterator that yields its elements as they are downloaded.
+
+    Memory use stays flat however large the response is.  Streamed responses bypass the cache.  Under fmpsdk.aio the
+    response is downloaded on the event loop first and the iterator walks the decoded list.
+    :param base_url: Versioned base URL of the FMP API.
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :return: Iterator of records.
+    """
+    responses = __deferred_responses.get()
+    if responses is not None:
+        return __replayed_json(
+            __replay_or_defer(responses, PendingRequest(base_url, path, query_vars))
         )
-        if len(response.content) > 0:
-            return_var = response.json()
+    return __stream_json(base_url, path, query_vars)
 
-        if len(response.content) == 0 or (
-            isinstance(return_var, dict) and len(return_var.keys()) == 0
-        ):
-            logging.warning("Response appears to have no data.  Returning empty List.")
-            return_var = []
 
-    except requests.Timeout:
-        logging.error(f"Connection to {url} timed out.")
-    except requests.ConnectionError:
-        logging.error(
-            f"Connection to {url} failed:  DNS failure, refused connection or some other connection related "
-            f"issue."
+def __replayed_json(
+    records: typing.Optional[typing.List],
+) -> typing.Iterator[typing.Any]:
+    """
+    Generator behind __iter_json under fmpsdk.aio: walk a response already decoded on the event loop.
+    :return: Like __stream_json, False if the request failed or the response was not a list.
+    """
+    if not isinstance(records, list):
+        if records is not None:
+            yield records
+        return False
+    yield from records
+    return True
+
+
+def __stream_json(
+    base_url: str, path: str, query_vars: typing.Dict
+) -> typing.Iterator[typing.Any]:
+    """
+    Generator behind __iter_json: GET the URL with a streamed body and parse it chunk by chunk.
+
+    Its return value (the value of `yield from`) is True if the response was a JSON array.  It is False if the request
+    failed, or if the body was something else, e.g. an error message object, which is then yielded whole.  Callers that
+    consume the whole stream can so tell a failure from a list.
+    """
+    url = f"{base_url}{path}"
+    started = time.perf_counter()
+    event = __new_event(path)
+    try:
+        try:
+            response = __get(url, query_vars, stream=True, event=event)
+        except requests.RequestException as e:
+            __request_failed(
+                f"Request to {url} failed.  Error: {e}", url, e, event=event
+            )
+            return False
+        with response:
+            if response.status_code != 200:
+                __request_failed(
+                    f"Request to {url} failed with HTTP status {response.status_code}.",
+                    url,
+                    status_code=response.status_code,
+                    event=event,
+                )
+                return False
+
+            def counted(chunks: typing.Iterable[bytes]) -> typing.Iterator[bytes]:
+                for chunk in chunks:
+                    event.decompressed_bytes += len(chunk)
+                    yield chunk
+
+            try:
+                return (
+                    yield from __iter_json_array(
+                        counted(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+                    )
+                )
+            except (requests.RequestException, ValueError) as e:
+                # The connection dropped or the body stopped being valid JSON part way through the response.
+                __request_failed(
+                    f"Reading the response from {url} failed.  Error: {e}",
+                    url,
+                    e,
+                    event=event,
+                )
+                return False
+            finally:
+                event.compressed_bytes = response.raw.tell()
+                __record_transfer(
+                    path, event.compressed_bytes, event.decompressed_bytes
+                )
+    finally:
+        __emit(event, started, __get_request_hooks())
+
+
+def __iter_json_v3(path: str, query_vars: typing.Dict) -> typing.Iterator[typing.Any]:
+    """
+    Query URL for a JSON array from v3 of FMP API, yielding its elements as they are downloaded.
+
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :return: Iterator of records.
+    """
+    return __iter_json(base_url=BASE_URL_v3, path=path, query_vars=query_vars)
+
+
+def __iter_json_v4(path: str, query_vars: typing.Dict) -> typing.Iterator[typing.Any]:
+    """
+    Query URL for a JSON array from v4 of FMP API, yielding its elements as they are downloaded.
+
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :return: Iterator of records.
+    """
+    return __iter_json(base_url=BASE_URL_v4, path=path, query_vars=query_vars)
+
+
+def __partial_filename(filename: str, request: PendingRequest) -> str:
+    """
+    Name of the file a download is written to until it is complete.
+
+    It is tied to the request (ignoring apikey) so an interrupted download is only ever resumed by the same request,
+    even when several symbols are saved under the same default filename.
+    """
+    query = tuple((k, v) for k, v in request.key[2] if k != "apikey")
+    digest = hashlib.sha1(repr((request.path, query)).encode()).hexdigest()[:12]
+    return f"{filename}.{digest}{PARTIAL_DOWNLOAD_SUFFIX}"
+
+
+def __write_file(request: PendingRequest, content: bytes) -> None:
+    """
+    Save content as request.filename atomically: readers see the old file or the complete new one, never a truncated
+    one.
+    """
+    partial = __partial_filename(request.filename, request)
+    with open(partial, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    __discard_validator(partial)
+    os.replace(partial, request.filename)
+
+
+def __range_validator(headers: typing.Mapping[str, str]) -> typing.Optional[str]:
+    """
+    Value for an If-Range header identifying the response headers came with: its strong ETag, else its Last-Modified.
+    """
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def __read_validator(partial: str) -> typing.Optional[str]:
+    """
+    Validator saved beside partial by __download_to(), or None if there is none.
+    """
+    try:
+        with open(f"{partial}{PARTIAL_VALIDATOR_SUFFIX}") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def __discard_validator(partial: str) -> None:
+    """
+    Remove the validator saved beside partial, if any.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(f"{partial}{PARTIAL_VALIDATOR_SUFFIX}")
+
+
+def __download_to(
+    url: str,
+    path: str,
+    query_vars: typing.Dict,
+    partial: str,
+    event: RequestEvent,
+) -> bool:
+    """
+    Stream one response into partial, resuming after the bytes it already holds when the server supports ranges.
+
+    A partial file is only resumed with an If-Range header carrying the ETag or Last-Modified of the response it came
+    from, so bytes of a file that has changed on the server since are never appended to; partial files without one
+    are downloaded again from the start.
+    :param url: URL to request.
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :param partial: File the download is written to.
+    :param event: The download's event, on which to record bytes and status.
+    :return: True once partial holds the whole file, False if it had to be discarded and the download restarted.
+        Raises requests.HTTPError if the server answered with an error.
+    """
+    offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+    validator = __read_validator(partial) if offset else None
+    headers = None
+    if validator is not None:
+        # Byte ranges count bytes of the body as sent, so ask for it uncompressed to line up with the file.
+        headers = {
+            "Range": f"bytes={offset}-",
+            "If-Range": validator,
+            "Accept-Encoding": "identity",
+        }
+    response = __get(url, query_vars, headers=headers, stream=True, event=event)
+    with response:
+        if validator is not None and response.status_code == 206:
+            if not response.headers.get("Content-Range", "").startswith(
+                f"bytes {offset}-"
+            ):
+                os.remove(partial)
+                __discard_validator(partial)
+                return False
+            mode = "ab"
+        elif validator is not None and response.status_code == 416:
+            # The partial file does not match what the server has now.
+            os.remove(partial)
+            __discard_validator(partial)
+            return False
+        elif response.status_code == 200:
+            # A full body: the first request, or the file changed since the partial one was written.
+            mode = "wb"
+            validator = __range_validator(response.headers)
+            if validator is None:
+                __discard_validator(partial)
+            else:
+                with open(f"{partial}{PARTIAL_VALIDATOR_SUFFIX}", "w") as f:
+                    f.write(validator)
+        else:
+            response.raise_for_status()
+            raise requests.HTTPError(
+                f"Unexpected HTTP status {response.status_code}.", response=response
+            )
+        written = 0
+        with open(partial, mode) as f:
+            try:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+            finally:
+                # Keep what arrived so a retry, or the next call, can resume from it.
+                f.flush()
+                os.fsync(f.fileno())
+                event.compressed_bytes += response.raw.tell()
+                event.decompressed_bytes += written
+                __record_transfer(path, response.raw.tell(), written)
+    return True
+
+
+def __download_v3(path: str, query_vars: typing.Dict, filename: str) -> None:
+    """
+    Download a CSV/ZIP file from v3 of FMP API using the shared session.
+
+    The body is streamed to a partial file in chunks, so memory use does not grow with the file, then fsynced and
+    renamed over filename.  A transfer that breaks off is resumed with a Range request, per the retry policy; if the
+    call still fails, the partial file is kept and the next call for the same request resumes from it.
+    :param path: Path after TLD of URL
+    :param query_vars: Dictionary of query values (after "?" of URL)
+    :param filename: Name of saved file.
+    """
+    request = PendingRequest(BASE_URL_v3, path, query_vars, filename)
+    responses = __deferred_responses.get()
+    if responses is not None:
+        __replay_or_defer(responses, request)
+        return
+
+    url = request.url
+    partial = __partial_filename(filename, request)
+    policy = __get_retry_policy()
+    give_up_at = time.monotonic() + policy.deadline
+    attempt = 0
+    started = time.perf_counter()
+    event = __new_event(path)
+    try:
+        while True:
+            offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+            try:
+                if not __download_to(url, path, query_vars, partial, event):
+                    continue
+                break
+            except __RETRYABLE_ERRORS:
+                # __get already retried failures to connect; resume only transfers that broke off part way.
+                progressed = (
+                    os.path.exists(partial) and os.path.getsize(partial) > offset
+                )
+                if not progressed or attempt >= policy.max_retries:
+                    raise
+                delay = policy.delay(attempt)
+                if time.monotonic() + delay > give_up_at:
+                    raise
+                attempt += 1
+                logging.warning(
+                    f"Resuming download of {url} at byte {os.path.getsize(partial)} in {delay:.2f}s "
+                    f"(retry {attempt} of {policy.max_retries})."
+                )
+                time.sleep(delay)
+        os.replace(partial, filename)
+        __discard_validator(partial)
+        size = os.path.getsize(filename)
+        seconds = time.perf_counter() - started
+        logging.info(
+            f"Downloaded {size} bytes to {filename} in {seconds:.2f}s ({size / max(seconds, 1e-9) / 1e6:.2f} MB/s)."
         )
-    except requests.TooManyRedirects:
-        logging.error(
-            f"Request to {url} exceeds the maximum number of predefined redirections."
+    except requests.HTTPError as e:
+        __request_failed(
+            f"Download of {url} failed with HTTP status {e.response.status_code}.",
+            url,
+            e,
+            status_code=e.response.status_code,
+            event=event,
         )
     except Exception as e:
-        logging.error(
-            f"A requests exception has occurred that we have not yet detailed an 'except' clause for.  "
-            f"Error: {e}"
-        )
-    return return_var
+        event.error = str(e)
+        raise
+    finally:
+        __emit(event, started, __get_request_hooks())
 
 
 def __validate_period(value: str) -> str: